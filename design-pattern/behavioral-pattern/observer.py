@@ -100,6 +100,304 @@ station.attach(display2)
 station.set_temperature(25)
 station.set_temperature(30)
 
+# ⚡ Async Fan-out (Publisher Never Waits for Slow Observers)
+# notify() above calls every observer on the publisher's thread, so set_temperature waits for the slowest display.
+# Here a publish is a single put into a bounded inbox; a fan-out thread copies it into a bounded mailbox per
+# observer, and a thread pool drains the mailboxes. A lagging observer can coalesce (only the latest value)
+# or receive what piled up as one batch.
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Mailbox:
+    def __init__(self, observer, capacity=1000, coalesce=False, max_batch=100):
+        self.observer = observer
+        self.capacity = capacity
+        self.coalesce = coalesce
+        self.max_batch = max_batch
+        self.pending = deque(maxlen=capacity)  # Bounded: appending to a full deque drops the oldest in O(1)
+        self.lock = threading.Lock()
+        self.scheduled = False
+        self.idle = threading.Event()
+        self.idle.set()
+        self.delivered = 0
+        self.dropped = 0
+        self.failed = 0
+        self.last_error = None
+
+    def offer(self, data):
+        # Returns True when the caller must schedule a drain
+        with self.lock:
+            if self.coalesce:
+                self.dropped += len(self.pending)
+                self.pending.clear()  # Only the latest value matters
+            elif len(self.pending) == self.capacity:
+                self.dropped += 1
+            self.pending.append(data)
+            if self.scheduled:
+                return False
+            self.scheduled = True
+            self.idle.clear()
+            return True
+
+    def drain(self):
+        try:
+            while True:
+                with self.lock:
+                    batch = [self.pending.popleft() for _ in range(min(self.max_batch, len(self.pending)))]
+                    if not batch:
+                        self.scheduled = False
+                        self.idle.set()
+                        return
+                update_batch = getattr(self.observer, "update_batch", None)
+                if update_batch and len(batch) > 1:
+                    self._deliver(update_batch, batch, len(batch))
+                else:
+                    for data in batch:
+                        self._deliver(self.observer.update, data, 1)
+        except BaseException:
+            # Never leave the mailbox marked as scheduled, or it would not be drained again
+            with self.lock:
+                self.scheduled = False
+                self.idle.set()
+            raise
+
+    def _deliver(self, update, data, count):
+        # A failing observer only loses this delivery; the pool future would swallow the error
+        try:
+            update(data)
+            self.delivered += count
+        except Exception as error:
+            self.failed += count
+            self.last_error = error
+            print(f"⚠️ {type(self.observer).__name__} failed: {error!r}")
+
+
+class NotificationDispatcher:
+    def __init__(self, max_workers=4, capacity=1000, coalesce=False, max_batch=100, inbox_capacity=10000):
+        self.defaults = {"capacity": capacity, "coalesce": coalesce, "max_batch": max_batch}
+        self.mailboxes = {}
+        self.inbox = queue.Queue(maxsize=inbox_capacity)
+        self.dropped = 0
+        self.pool = ThreadPoolExecutor(max_workers=max_workers)
+        self.fanout_thread = threading.Thread(target=self._fan_out, daemon=True)
+        self.fanout_thread.start()
+
+    def register(self, observer, **options):
+        self.mailboxes[id(observer)] = Mailbox(observer, **{**self.defaults, **options})
+
+    def unregister(self, observer):
+        self.mailboxes.pop(id(observer), None)
+
+    def publish(self, data):
+        # O(1) regardless of how many observers there are; if fan-out falls a whole inbox behind,
+        # the reading is dropped rather than making the publisher wait
+        try:
+            self.inbox.put_nowait(data)
+        except queue.Full:
+            self.dropped += 1
+
+    def _fan_out(self):
+        while True:
+            data = self.inbox.get()
+            if data is _STOP:
+                return
+            if isinstance(data, _Flush):
+                data.done.set()
+                continue
+            for mailbox in list(self.mailboxes.values()):
+                if mailbox.offer(data):
+                    self.pool.submit(mailbox.drain)
+
+    def flush(self, timeout=None):
+        # Wait until everything published so far has been delivered
+        marker = _Flush()
+        self.inbox.put(marker)
+        marker.done.wait(timeout)
+        for mailbox in list(self.mailboxes.values()):
+            mailbox.idle.wait(timeout)
+
+    def close(self):
+        self.flush()
+        self.inbox.put(_STOP)
+        self.fanout_thread.join()
+        self.pool.shutdown()
+
+
+class _Flush:
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class AsyncSubject(Subject):
+    def __init__(self, dispatcher=None):
+        super().__init__()
+        self.dispatcher = dispatcher or NotificationDispatcher()
+
+    def attach(self, observer, **options):
+        super().attach(observer)
+        self.dispatcher.register(observer, **options)
+
+    def detach(self, observer):
+        super().detach(observer)
+        self.dispatcher.unregister(observer)
+
+    def notify(self, data):
+        self.dispatcher.publish(data)
+
+
+class AsyncWeatherStation(AsyncSubject):
+    def __init__(self, dispatcher=None):
+        super().__init__(dispatcher)
+        self._temperature = 0
+
+    def set_temperature(self, temp):
+        self._temperature = temp
+        self.notify(temp)
+
+
+class SlowDashboardDisplay(Observer):
+    def update(self, temperature):
+        time.sleep(0.05)  # Simulated slow network push
+        print(f"🐢 Slow Dashboard: {temperature}°C")
+
+
+class ChartDisplay(Observer):
+    def update_batch(self, temperatures):
+        print(f"📈 Chart Display: {len(temperatures)} readings, latest {temperatures[-1]}°C")
+
+    def update(self, temperature):
+        print(f"📈 Chart Display: {temperature}°C")
+
+
+print("\n🔹 **Async fan-out**")
+async_station = AsyncWeatherStation()
+async_station.attach(SlowDashboardDisplay(), coalesce=True)  # Only cares about the latest reading
+async_station.attach(ChartDisplay())  # Wants every reading, batched when it falls behind
+
+started = time.perf_counter()
+for temp in range(20, 31):
+    async_station.set_temperature(temp)
+publish_seconds = time.perf_counter() - started
+async_station.dispatcher.close()  # Waits for the displays to catch up
+print(f"⚡ Published 11 readings in {publish_seconds * 1e6:.0f} µs")
+
+
+class BrokenDisplay(Observer):
+    def update(self, temperature):
+        if temperature % 2:
+            raise ConnectionError("display offline")
+
+
+# A failing observer is counted and skipped; its mailbox keeps draining and close() still returns
+broken_display = BrokenDisplay()
+flaky_station = AsyncWeatherStation()
+flaky_station.attach(broken_display)
+for temp in range(20, 24):
+    flaky_station.set_temperature(temp)
+flaky_station.dispatcher.close()
+broken_mailbox = flaky_station.dispatcher.mailboxes[id(broken_display)]
+print(f"🧯 Broken display: {broken_mailbox.delivered} delivered, {broken_mailbox.failed} failed")
+
+# 🎯 Topic-Indexed, Weakly Referenced Subscriptions
+# Subject keeps one list: detach is O(n), every observer gets every event, and a forgotten observer lives forever.
+# TopicSubject indexes subscribers by topic in WeakSets: attach/detach are O(1), a publish only touches the
+# observers of that topic, and an observer that is garbage-collected drops out of every topic by itself.
+import gc
+import weakref
+
+ALL_TOPICS = "*"
+
+
+class TopicSubject:
+    def __init__(self):
+        self._topics = {}  # topic -> WeakSet of observers
+        self._predicates = {}  # id(observer) -> (weakref to observer, [predicate(topic, data), ...])
+
+    def attach(self, observer, topic=ALL_TOPICS, predicate=None):
+        if predicate is not None:
+            # Predicate subscriptions can't be indexed, so they are checked on every publish
+            key = id(observer)
+            entry = self._predicates.get(key)
+            if entry is None:
+                entry = self._predicates[key] = (weakref.ref(observer, lambda _, key=key: self._predicates.pop(key, None)), [])
+            entry[1].append(predicate)
+            return
+        subscribers = self._topics.get(topic)
+        if subscribers is None:
+            subscribers = self._topics[topic] = weakref.WeakSet()
+        subscribers.add(observer)
+
+    def detach(self, observer, topic=ALL_TOPICS, predicate=None):
+        if predicate is not None:
+            # Only the given predicate goes; the observer's topics and other predicates stay
+            entry = self._predicates.get(id(observer))
+            if entry is not None and predicate in entry[1]:
+                entry[1].remove(predicate)
+                if not entry[1]:
+                    del self._predicates[id(observer)]
+            return
+        subscribers = self._topics.get(topic)
+        if subscribers is not None:
+            subscribers.discard(observer)
+            if not subscribers:
+                del self._topics[topic]
+
+    def subscriber_count(self, topic):
+        return len(self._topics.get(topic, ()))
+
+    def notify(self, topic, data):
+        notified = set()
+        for key in (topic, ALL_TOPICS):
+            for observer in list(self._topics.get(key, ())):
+                if id(observer) not in notified:
+                    notified.add(id(observer))
+                    observer.update(data)
+        for observer_ref, predicates in list(self._predicates.values()):
+            observer = observer_ref()
+            if observer is not None and id(observer) not in notified and any(predicate(topic, data) for predicate in predicates):
+                observer.update(data)
+
+
+class SensorNetwork(TopicSubject):
+    def set_reading(self, sensor_id, temp):
+        self.notify(sensor_id, temp)
+
+
+class SensorDisplay(Observer):
+    def __init__(self, name):
+        self.name = name
+
+    def update(self, temperature):
+        print(f"🛰️ {self.name}: {temperature}°C")
+
+
+print("\n🔹 **Topic subscriptions**")
+network = SensorNetwork()
+roof_display = SensorDisplay("Roof Display")
+lobby_display = SensorDisplay("Lobby Display")
+heat_alarm = SensorDisplay("Heat Alarm")
+
+network.attach(roof_display, topic="sensor-roof")
+network.attach(lobby_display, topic="sensor-lobby")
+network.attach(heat_alarm, predicate=lambda topic, temp: temp > 35)
+network.attach(heat_alarm, predicate=lambda topic, temp: temp < 0)  # A second rule for the same alarm
+
+network.set_reading("sensor-roof", 28)  # Only the roof display wakes up
+network.set_reading("sensor-lobby", 40)  # Lobby display and the heat alarm
+network.detach(heat_alarm, topic="sensor-roof")  # A topic detach leaves its predicates alone
+network.set_reading("sensor-roof", -5)  # Roof display and the heat alarm's freezing rule
+
+del roof_display  # No detach needed: the WeakSet forgets it
+gc.collect()
+print(f"🧹 Roof subscribers after the display is gone: {network.subscriber_count('sensor-roof')}")
+
 # 🔑 Key Benefits
 # ✅ Decoupled & Extensible – New observers (e.g., a web dashboard) can be added without modifying existing code.
 # ✅ Automatic Updates – No need to manually call update functions; all observers get notified automatically.
@@ -76,6 +76,112 @@ print(room)
 # Output: Room Type: Deluxe, Bed: King, TV: True, WiFi: True, Minibar: False
 
 
+# 📦 Batch Builder (Columnar Room Table)
+# Setting up a large property with HotelRoomBuilder creates one object per room, even though rooms differ
+# only in a few amenities. HotelRoomBatchBuilder takes amenity specs with counts and builds one columnar
+# RoomTable: room type and bed as small integer codes, and TV/WiFi/minibar packed as bit flags in one byte.
+# A HotelRoom is only materialized when a room is actually accessed.
+from array import array
+
+HAS_TV = 1
+HAS_WIFI = 2
+HAS_MINIBAR = 4
+
+
+class RoomSpec:
+    # Same chained vocabulary as HotelRoomBuilder, but describes rooms instead of building one
+    def __init__(self, room_type, bed):
+        self.room_type = room_type
+        self.bed = bed
+        self.flags = 0
+
+    def add_tv(self):
+        self.flags |= HAS_TV
+        return self
+
+    def add_wifi(self):
+        self.flags |= HAS_WIFI
+        return self
+
+    def add_minibar(self):
+        self.flags |= HAS_MINIBAR
+        return self
+
+
+class RoomTable:
+    def __init__(self, room_types, beds, type_codes, bed_codes, flags):
+        self.room_types = room_types  # Code -> name dictionaries
+        self.beds = beds
+        self.type_codes = type_codes
+        self.bed_codes = bed_codes
+        self.flags = flags
+
+    def __len__(self):
+        return len(self.flags)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # A slice stays columnar: a smaller RoomTable, still without HotelRoom objects
+            return RoomTable(self.room_types, self.beds, self.type_codes[index], self.bed_codes[index], self.flags[index])
+        flags = self.flags[index]
+        return HotelRoom(
+            self.room_types[self.type_codes[index]],
+            self.beds[self.bed_codes[index]],
+            has_tv=bool(flags & HAS_TV),
+            has_wifi=bool(flags & HAS_WIFI),
+            has_minibar=bool(flags & HAS_MINIBAR),
+        )
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+    def count_with(self, required_flags):
+        # Answered from the flag column alone: no HotelRoom objects are created
+        return sum(1 for flags in self.flags if flags & required_flags == required_flags)
+
+    def nbytes(self):
+        return sum(column.itemsize * len(column) for column in (self.type_codes, self.bed_codes, self.flags))
+
+
+class HotelRoomBatchBuilder:
+    def __init__(self):
+        self.room_types = []
+        self.beds = []
+        self.type_codes = array('B')  # Up to 256 room types / bed kinds
+        self.bed_codes = array('B')
+        self.flags = array('B')
+
+    @staticmethod
+    def _code(values, value):
+        if value not in values:
+            values.append(value)
+        return values.index(value)
+
+    def add(self, spec, count=1):
+        self.type_codes.extend([self._code(self.room_types, spec.room_type)] * count)
+        self.bed_codes.extend([self._code(self.beds, spec.bed)] * count)
+        self.flags.extend([spec.flags] * count)
+        return self
+
+    def build(self):
+        # Copies, so adding more rooms to the builder afterwards can't change a table already built
+        return RoomTable(list(self.room_types), list(self.beds), array('B', self.type_codes), array('B', self.bed_codes), array('B', self.flags))
+
+
+room_table = (
+    HotelRoomBatchBuilder()
+    .add(RoomSpec("Deluxe", "King").add_tv().add_wifi(), count=120000)
+    .add(RoomSpec("Standard", "Queen").add_wifi(), count=250000)
+    .add(RoomSpec("Suite", "King").add_tv().add_wifi().add_minibar(), count=30000)
+    .build()
+)
+
+print(f"📦 {len(room_table)} rooms in {room_table.nbytes() / 1024:.0f} KiB of columns")
+print(f"📺 Rooms with TV and WiFi: {room_table.count_with(HAS_TV | HAS_WIFI)}")
+print(room_table[len(room_table) - 1])  # Materialized on access
+# Output: Room Type: Suite, Bed: King, TV: True, WiFi: True, Minibar: True
+print(f"🔪 Last 30000 rooms with a minibar: {room_table[-30000:].count_with(HAS_MINIBAR)}")
+
 # 🔑 Key Benefits
 # ✔️ More Readable – Easy to understand which features are included.
 # ✔️ Flexible Object Creation – You can add only the features you need.
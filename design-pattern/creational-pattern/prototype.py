@@ -65,6 +65,125 @@ room2.has_minibar = True  # Customization
 print(room1)
 print(room2)
 
+# ⚡ Prototype Registry with Fast Cloning (No Whole-Object deepcopy)
+# copy.deepcopy walks and memoizes the whole object graph on every clone, which is slow when setting up
+# thousands of rooms. The registry decides once per template field how a clone gets it: immutable values
+# (strings, numbers, tuples of them) are shared, flat lists/dicts/sets get a C-level .copy(), and only
+# nested mutable values fall back to deepcopy. Clones keep the original types and own their containers,
+# and cloning works for both __dict__ and __slots__ classes.
+import time
+
+IMMUTABLE_TYPES = (str, bytes, int, float, complex, bool, type(None), frozenset)
+
+
+def is_immutable(value):
+    if isinstance(value, tuple):
+        return all(is_immutable(item) for item in value)
+    return isinstance(value, IMMUTABLE_TYPES)
+
+
+def field_copier(value):
+    # None means the value can be shared by every clone
+    if is_immutable(value):
+        return None
+    if type(value) in (list, set) and all(is_immutable(item) for item in value):
+        return type(value).copy
+    if type(value) is dict and all(is_immutable(item) for item in value.values()):
+        return dict.copy
+    return copy.deepcopy
+
+
+def slot_names(cls):
+    names = []
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        names.extend([slots] if isinstance(slots, str) else slots)
+    return [name for name in names if name not in ("__dict__", "__weakref__")]
+
+
+class PrototypeRegistry:
+    def __init__(self):
+        self._templates = {}
+
+    def register(self, name, prototype):
+        cls = type(prototype)
+        slots = slot_names(cls)
+        state = {}
+        for field in slots:
+            if hasattr(prototype, field):
+                state[field] = getattr(prototype, field)
+        if hasattr(prototype, "__dict__"):
+            state.update(vars(prototype))
+        # Snapshot the template so later changes to `prototype` don't leak into clones
+        state = copy.deepcopy(state)
+        copiers = {field: field_copier(value) for field, value in state.items()}
+        self._templates[name] = (cls, state, copiers, set(slots))
+
+    def clone(self, name, **overrides):
+        return self.clone_many(name, 1, **overrides)[0]
+
+    def clone_many(self, name, n, **overrides):
+        cls, state, copiers, slots = self._templates[name]
+        state = {**state, **overrides}
+        copiers = {**copiers, **{field: field_copier(value) for field, value in overrides.items()}}
+        shared_slots = [(field, value) for field, value in state.items() if field in slots and copiers[field] is None]
+        shared_dict = {field: value for field, value in state.items() if field not in slots and copiers[field] is None}
+        copied = [(field, value, copiers[field], field in slots) for field, value in state.items() if copiers[field] is not None]
+        new = cls.__new__
+        set_field = object.__setattr__
+        clones = []
+        for _ in range(n):
+            room = new(cls)  # Skips __init__: the template already holds the validated state
+            for field, value in shared_slots:
+                set_field(room, field, value)
+            if shared_dict:
+                room.__dict__.update(shared_dict)
+            for field, value, copier, is_slot in copied:
+                if is_slot:
+                    set_field(room, field, copier(value))
+                else:
+                    room.__dict__[field] = copier(value)
+            clones.append(room)
+        return clones
+
+
+class SlottedHotelRoom:
+    __slots__ = ("room_type", "bed", "has_tv", "has_wifi", "has_minibar", "amenities")
+
+    def __init__(self, room_type, bed, has_tv=False, has_wifi=False, has_minibar=False, amenities=()):
+        self.room_type = room_type
+        self.bed = bed
+        self.has_tv = has_tv
+        self.has_wifi = has_wifi
+        self.has_minibar = has_minibar
+        self.amenities = amenities
+
+    def __str__(self):
+        return f"Room Type: {self.room_type}, Bed: {self.bed}, TV: {self.has_tv}, WiFi: {self.has_wifi}, Minibar: {self.has_minibar}, Amenities: {sorted(self.amenities)}"
+
+
+registry = PrototypeRegistry()
+registry.register("deluxe-king", HotelRoom("Deluxe", "King", has_tv=True, has_wifi=True))
+registry.register("suite", SlottedHotelRoom("Suite", "King", True, True, True, amenities={"bathrobe", "espresso"}))
+
+suite = registry.clone("suite")
+suite_with_view = registry.clone("suite", amenities=suite.amenities | {"sea view"})  # New value, template untouched
+print(suite)
+print(suite_with_view)
+suite.amenities.add("late checkout")  # Each clone owns its set, so this only changes `suite`
+print(f"🔗 Next suite clone: {sorted(registry.clone('suite').amenities)}")
+
+for name, template in (("deluxe-king", prototype_room), ("suite", SlottedHotelRoom("Suite", "King", True, True, True, amenities={"bathrobe", "espresso"}))):
+    count = 20000
+    started = time.perf_counter()
+    for _ in range(count):
+        copy.deepcopy(template)
+    deepcopy_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    registry.clone_many(name, count)
+    fast_seconds = time.perf_counter() - started
+    print(f"⏱️ {count} × {name}: deepcopy {deepcopy_seconds * 1000:.0f} ms vs clone_many {fast_seconds * 1000:.0f} ms")
+
 # 🔑 Key Benefits of the Prototype Pattern
 # ✔️ Performance Optimization – Avoids unnecessary object creation overhead.
 # ✔️ Simplifies Object Creation – Cloning avoids complex constructor logic.
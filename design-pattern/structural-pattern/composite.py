@@ -52,34 +52,99 @@ folder.show()
 
 # Component (Base Class)
 class FileSystemComponent:
+    __slots__ = ("name", "parent")  # No per-node __dict__: millions of nodes stay small
+
+    def walk(self):
+        # Iterative pre-order traversal: an explicit stack instead of recursion, so depth is unlimited,
+        # and a generator, so huge trees stream node by node
+        stack = [(0, self)]
+        while stack:
+            depth, node = stack.pop()
+            yield depth, node
+            children = getattr(node, "children", None)
+            if children:
+                stack.extend((depth + 1, child) for child in reversed(children))
+
     def show(self):
-        pass
+        for depth, node in self.walk():
+            print(f"{'  ' * depth}{node.label()}")
+
+    def _propagate(self, size_delta, file_delta, folder_delta):
+        # Push a change up the ancestor path so every folder's totals stay current in O(depth)
+        folder = self.parent
+        while folder is not None:
+            folder.total_size += size_delta
+            folder.file_count += file_delta
+            folder.folder_count += folder_delta
+            folder = folder.parent
 
 # Leaf (File)
 class File(FileSystemComponent):
-    def __init__(self, name):
+    __slots__ = ("size",)
+
+    def __init__(self, name, size=0):
         self.name = name
+        self.parent = None
+        self.size = size
 
-    def show(self):
-        print(f"File: {self.name}")
+    def label(self):
+        return f"File: {self.name}"
+
+    def totals(self):
+        return self.size, 1, 0
+
+    def resize(self, size):
+        delta = size - self.size
+        self.size = size
+        self._propagate(delta, 0, 0)
 
 # Composite (Folder)
 class Folder(FileSystemComponent):
+    __slots__ = ("children", "total_size", "file_count", "folder_count")
+
     def __init__(self, name):
         self.name = name
+        self.parent = None
         self.children = []
+        self.total_size = 0  # Cached aggregates for the whole subtree, answered in O(1)
+        self.file_count = 0
+        self.folder_count = 0
+
+    def label(self):
+        return f"Folder: {self.name}"
+
+    def totals(self):
+        return self.total_size, self.file_count, self.folder_count + 1
 
     def add(self, component):
+        # A folder placed under itself or a descendant would make the parent chain a loop
+        ancestor = self
+        while ancestor is not None:
+            if ancestor is component:
+                raise ValueError(f"Cannot add {component.name} to {self.name}: it would contain itself")
+            ancestor = ancestor.parent
+        if component.parent is not None:
+            component.parent.remove(component)
         self.children.append(component)
+        component.parent = self
+        size, files, folders = component.totals()
+        self.total_size += size
+        self.file_count += files
+        self.folder_count += folders
+        self._propagate(size, files, folders)
 
-    def show(self):
-        print(f"Folder: {self.name}")
-        for child in self.children:
-            child.show()
+    def remove(self, component):
+        self.children.remove(component)
+        component.parent = None
+        size, files, folders = component.totals()
+        self.total_size -= size
+        self.file_count -= files
+        self.folder_count -= folders
+        self._propagate(-size, -files, -folders)
 
 # Client Code
-file1 = File("document.txt")
-file2 = File("image.png")
+file1 = File("document.txt", 1200)
+file2 = File("image.png", 48000)
 
 folder = Folder("MyFolder")
 folder.add(file1)
@@ -87,9 +152,118 @@ folder.add(file2)
 
 root = Folder("Root")
 root.add(folder)
-root.add(File("video.mp4"))
+root.add(File("video.mp4", 7500000))
 
 root.show()
+print(f"📦 Root: {root.total_size} bytes in {root.file_count} files")  # Cached, no tree walk
+
+try:
+    folder.add(root)  # Root is MyFolder's ancestor
+except ValueError as error:
+    print(f"🚫 {error}")
+
+file2.resize(50000)
+root.remove(folder)
+print(f"📦 Root after removing MyFolder: {root.total_size} bytes in {root.file_count} files")
+
+# A path 100k folders deep would overflow a recursive show(); the iterative walk doesn't care
+deep = Folder("deep-99999")
+for level in range(99998, -1, -1):
+    parent = Folder(f"deep-{level}")
+    parent.add(deep)  # Built bottom-up, so each add has no ancestors to update yet
+    deep = parent
+print(f"🌲 Walked {sum(1 for _ in deep.walk())} nested folders without recursion")
+
+# 📂 Loading Real Directories (Parallel os.scandir)
+# Mirror a directory tree from disk into File/Folder nodes. Each directory is scanned by a thread pool
+# task that queues its subdirectories as new tasks. Workers only link children to parents; the cached
+# totals are then filled in with one bottom-up pass, so no two threads ever update the same ancestors.
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def rebuild_totals(root):
+    folders = [node for _, node in root.walk() if isinstance(node, Folder)]
+    for folder in reversed(folders):  # Children before parents
+        folder.total_size = folder.file_count = folder.folder_count = 0
+        for child in folder.children:
+            size, files, subfolders = child.totals()
+            folder.total_size += size
+            folder.file_count += files
+            folder.folder_count += subfolders
+
+
+def load_tree(path, max_workers=8, errors=None):
+    # Unreadable or vanished directories and entries are skipped instead of failing the whole load;
+    # pass a list as `errors` to collect them as (path, OSError) pairs
+    root = Folder(sys.intern(os.path.basename(os.path.abspath(path))))
+    if errors is None:
+        errors = []
+
+    def scan(folder, directory):
+        subdirectories = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = sys.intern(entry.name)  # Repeated names like "index.html" share one string
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            child = Folder(name)
+                            subdirectories.append((child, entry.path))
+                        else:
+                            child = File(name, entry.stat(follow_symlinks=False).st_size)
+                    except OSError as error:
+                        errors.append((entry.path, error))
+                        continue
+                    child.parent = folder
+                    folder.children.append(child)
+        except OSError as error:
+            errors.append((directory, error))  # Keeps whatever was listed before the failure
+        return [pool.submit(scan, child, child_path) for child, child_path in subdirectories]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = [pool.submit(scan, root, path)]
+        while pending:
+            pending.extend(pending.pop().result())
+    rebuild_totals(root)
+    return root
+
+
+def make_synthetic_tree(base, file_count, files_per_dir=100, dirs_per_dir=10):
+    # Breadth-first layout: directories of `files_per_dir` small files, each with `dirs_per_dir` subdirectories
+    directories = [base]
+    created = 0
+    index = 0
+    while created < file_count:
+        directory = directories[index]
+        index += 1
+        for i in range(min(files_per_dir, file_count - created)):
+            with open(os.path.join(directory, f"file{i}.txt"), "w") as f:
+                f.write("x" * (i % 7))
+        created += min(files_per_dir, file_count - created)
+        for i in range(dirs_per_dir):
+            subdirectory = os.path.join(directory, f"dir{i}")
+            os.mkdir(subdirectory)
+            directories.append(subdirectory)
+
+
+# Pass --bench N to mirror a synthetic tree of N files (e.g. --bench 1000000); the default stays small
+file_total = int(sys.argv[sys.argv.index("--bench") + 1]) if "--bench" in sys.argv else 2000
+with tempfile.TemporaryDirectory() as tree_dir:
+    started = time.perf_counter()
+    make_synthetic_tree(tree_dir, file_total)
+    print(f"\n🛠️ Generated {file_total} files in {time.perf_counter() - started:.1f} s")
+    for workers in (1, 8):
+        started = time.perf_counter()
+        mirrored = load_tree(tree_dir, max_workers=workers)
+        print(f"📂 Loaded with {workers} worker(s) in {time.perf_counter() - started:.2f} s: "
+              f"{mirrored.file_count} files, {mirrored.folder_count} folders, {mirrored.total_size} bytes")
+    load_errors = []
+    missing = load_tree(os.path.join(tree_dir, "missing"), errors=load_errors)  # Recorded, not raised
+    print(f"🧱 Missing directory: {missing.file_count} files, errors: {[type(error).__name__ for _, error in load_errors]}")
 
 # 🔥 Output:
 # Folder: Root
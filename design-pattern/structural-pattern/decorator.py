@@ -49,24 +49,32 @@ class Coffee:
 
 # Decorator Base Class
 class CoffeeDecorator:
+    price = 0  # What this add-on adds to the cost
+    add_ons = []  # Registry of purely additive decorators, see add_on_vector below
+    add_on_index = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Decorators that only set `price` join the registry; ones with their own cost() are priced by calling it
+        if cls.cost is CoffeeDecorator.cost:
+            CoffeeDecorator.add_on_index[cls] = len(CoffeeDecorator.add_ons)
+            CoffeeDecorator.add_ons.append(cls)
+
     def __init__(self, coffee):
         self._coffee = coffee
 
     def cost(self):
-        return self._coffee.cost()
+        return self._coffee.cost() + self.price
 
 # Concrete Decorators
 class Milk(CoffeeDecorator):
-    def cost(self):
-        return super().cost() + 2
+    price = 2
 
 class Sugar(CoffeeDecorator):
-    def cost(self):
-        return super().cost() + 1
+    price = 1
 
 class Caramel(CoffeeDecorator):
-    def cost(self):
-        return super().cost() + 3
+    price = 3
 
 # Client Code
 coffee = Coffee()  # Plain Coffee (5)
@@ -76,6 +84,98 @@ coffee = Caramel(coffee)  # Add Caramel (8 + 3)
 
 print(coffee.cost())  # Output: 11
 
+# ⚡ Compiled Decorator Stacks & Batch Pricing
+# cost() walks the whole wrapper chain on every call. Since most add-ons just add their price, a stack
+# can be compiled once into an add-on count vector (Milk ×1, Sugar ×2, ...) plus the base price.
+# A single order is then priced from a cached total, and many orders at once as counts · price table.
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # Batch pricing falls back to plain Python without NumPy
+    np = None
+
+ADD_ONS = CoffeeDecorator.add_ons  # Grows as new decorators are defined
+ADD_ON_INDEX = CoffeeDecorator.add_on_index
+
+
+def add_on_prices():
+    return [add_on.price for add_on in ADD_ONS]
+
+
+def add_on_vector(coffee):
+    # Unwrap the stack iteratively: count each add-on and find the base coffee. A layer with its own
+    # cost() can't be reduced to a count, so it becomes the base and is priced by calling it
+    counts = [0] * len(ADD_ONS)
+    layer = coffee
+    while type(layer) in ADD_ON_INDEX:
+        counts[ADD_ON_INDEX[type(layer)]] += 1
+        layer = layer._coffee
+    return tuple(counts), layer
+
+
+@lru_cache(maxsize=4096)
+def price_for(counts, base_cost):
+    # Identical stacks (the same add-on counts) share one cached total
+    return base_cost + sum(count * price for count, price in zip(counts, add_on_prices()))
+
+
+def compile_order(coffee):
+    counts, base = add_on_vector(coffee)
+    total = price_for(counts, base.cost())
+    return lambda: total  # Flat price function: no chain walk on later calls
+
+
+def price_orders(order_counts, base_cost=None):
+    # order_counts: one row of add-on counts per order, in ADD_ONS order
+    if base_cost is None:
+        base_cost = Coffee().cost()
+    prices = add_on_prices()
+    if np is not None:
+        return np.asarray(order_counts) @ np.asarray(prices) + base_cost
+    return [base_cost + sum(count * price for count, price in zip(row, prices)) for row in order_counts]
+
+
+compiled_price = compile_order(coffee)
+print(f"⚡ Compiled price: {compiled_price()} (add-ons {add_on_vector(coffee)[0]})")  # Output: 11
+
+# Three orders: Milk+Sugar, Caramel×2, plain
+print(f"🧾 Batch prices: {[int(price) for price in price_orders([[1, 1, 0], [0, 0, 2], [0, 0, 0]])]}")  # [8, 11, 5]
+
+
+class Whip(CoffeeDecorator):  # Defined later, still joins the registry
+    price = 1.5
+
+
+class DoubleShot(CoffeeDecorator):  # Not additive: compiled stacks call its cost()
+    def cost(self):
+        return self._coffee.cost() * 2
+
+
+special = Whip(DoubleShot(Milk(Coffee())))
+print(f"🍦 Whip on a double shot with milk: {compile_order(special)()} (chain {special.cost()})")  # 15.5
+
+import random
+import time
+
+deep_order = Coffee()
+for _ in range(50):
+    deep_order = random.choice(ADD_ONS)(deep_order)
+started = time.perf_counter()
+for _ in range(10000):
+    deep_order.cost()
+chain_seconds = time.perf_counter() - started
+compiled_deep = compile_order(deep_order)
+started = time.perf_counter()
+for _ in range(10000):
+    compiled_deep()
+print(f"⏱️ 50 add-ons: chain {chain_seconds / 10000 * 1e6:.2f} µs vs compiled {(time.perf_counter() - started) / 10000 * 1e6:.3f} µs per price")
+
+many_orders = [[random.randint(0, 3) for _ in ADD_ONS] for _ in range(100000)]
+started = time.perf_counter()
+price_orders(many_orders)
+print(f"🧾 Priced {len(many_orders)} orders in one batch in {(time.perf_counter() - started) * 1000:.1f} ms ({'NumPy' if np is not None else 'pure Python'})")
+
 # 🔑 Key Benefits of the Decorator Pattern
 # ✔️ Dynamically add behavior at runtime (instead of modifying code).
 # ✔️ More flexible than inheritance (no subclass explosion).
@@ -76,6 +76,188 @@ char3.render((20, 20))
 # ✅ Memory usage is reduced by sharing common objects.
 # ✅ Performance is optimized by reusing already created objects.
 
+# 🏭 Production Flyweight Registry (Bounded, Thread-Safe, Measured)
+# CharacterFactory._characters grows forever, and two threads can both miss and create the same key.
+# FlyweightRegistry bounds the pool and evicts with the CLOCK approximation of LRU, which lets hits
+# stay lock-free: a hit only sets a "recently used" flag. Misses take a lock and re-check before creating,
+# so each key is built exactly once. mode="weak" instead keeps flyweights only while something uses them.
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+
+def estimate_size(obj):
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__) + sum(sys.getsizeof(value) for value in vars(obj).values())
+    return size
+
+
+class FlyweightRegistry:
+    def __init__(self, factory, maxsize=10000, mode="lru"):
+        self.factory = factory
+        self.maxsize = maxsize
+        self.mode = mode
+        self._entries = weakref.WeakValueDictionary() if mode == "weak" else {}
+        self._clock = OrderedDict()  # Keys in CLOCK order; the value is the "recently used" flag
+        self._lock = threading.Lock()
+        self._sizes = {}  # key -> estimated size of that flyweight, for bytes_saved
+        self.hits = 0  # Updated without the lock, so approximate under heavy contention
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+
+    def get(self, *key):
+        flyweight = self._entries.get(key)
+        if flyweight is not None:
+            self._hit(key)
+            return flyweight
+        with self._lock:
+            flyweight = self._entries.get(key)  # Another thread may have created it meanwhile
+            if flyweight is not None:
+                self._hit(key)
+                return flyweight
+            flyweight = self.factory(*key)
+            self.misses += 1
+            self._sizes[key] = estimate_size(flyweight)
+            if self.mode == "weak":
+                weakref.finalize(flyweight, self._sizes.pop, key, None)
+            self._entries[key] = flyweight
+            if self.mode == "lru":
+                self._clock[key] = False
+                while len(self._entries) > self.maxsize:
+                    self._evict_one()
+            return flyweight
+
+    def _hit(self, key):
+        if self.mode == "lru":
+            self._clock[key] = True
+        self.hits += 1
+        self.bytes_saved += self._sizes.get(key, 0)
+
+    def _evict_one(self):
+        # Sweep the clock hand: recently used keys get a second chance, the first unused one goes
+        while True:
+            key, recently_used = self._clock.popitem(last=False)
+            if key not in self._entries:
+                continue  # A lock-free hit re-flagged a key that was already evicted
+            if recently_used:
+                self._clock[key] = False
+            else:
+                del self._entries[key]
+                self._sizes.pop(key, None)
+                self.evictions += 1
+                return
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize if self.mode == "lru" else None,
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+        }
+
+
+character_pool = FlyweightRegistry(Character, maxsize=2)
+
+def render_text(text):
+    for char in text:
+        character_pool.get(char, 'Arial', 'Black')
+
+threads = [threading.Thread(target=render_text, args=("ABABABABCA",)) for _ in range(4)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+
+print(f"📊 Pool stats: {character_pool.stats()}")
+
+# 📄 Array-Backed Documents (Extrinsic State in Typed Arrays)
+# Even with shared Character objects, a document that keeps one (character, position) pair per glyph
+# pays for a tuple and two boxed ints each time. GlyphDocument stores a small int glyph id plus x/y
+# in parallel typed arrays (a few bytes per glyph), and render_range walks them in one pass.
+import io
+from array import array
+
+
+class GlyphTable:
+    # Append-only id <-> flyweight mapping; ids stay valid for the document's lifetime
+    def __init__(self):
+        self.glyphs = []
+        self.ids = {}
+        self.render_prefixes = []  # Render text is formatted once per glyph style, not once per glyph
+        self.render_suffixes = []
+
+    def glyph_id(self, char, font, color):
+        key = (char, font, color)
+        glyph_id = self.ids.get(key)
+        if glyph_id is None:
+            glyph = CharacterFactory.get_character(char, font, color)
+            glyph_id = len(self.glyphs)
+            self.glyphs.append(glyph)
+            self.ids[key] = glyph_id
+            self.render_prefixes.append(f"Rendering '{glyph.char}' at (")
+            self.render_suffixes.append(f") with font {glyph.font} and color {glyph.color}\n")
+        return glyph_id
+
+
+class GlyphDocument:
+    def __init__(self, table=None):
+        self.table = table or GlyphTable()
+        self.glyph_ids = array('H')  # Up to 65536 distinct glyph styles
+        self.xs = array('i')
+        self.ys = array('i')
+
+    def add(self, char, font, color, x, y):
+        self.glyph_ids.append(self.table.glyph_id(char, font, color))
+        self.xs.append(x)
+        self.ys.append(y)
+
+    def add_text(self, text, font, color, x, y, advance=7):
+        table = self.table
+        self.glyph_ids.extend(table.glyph_id(char, font, color) for char in text)
+        self.xs.extend(range(x, x + advance * len(text), advance))
+        self.ys.extend([y] * len(text))
+
+    def __len__(self):
+        return len(self.glyph_ids)
+
+    def glyph(self, index):
+        return self.table.glyphs[self.glyph_ids[index]], (self.xs[index], self.ys[index])
+
+    def render_range(self, start, stop, out=None):
+        # One pass over the arrays: no Character method calls and no per-glyph objects
+        out = out or sys.stdout
+        prefixes = self.table.render_prefixes
+        suffixes = self.table.render_suffixes
+        out.write("".join(
+            f"{prefixes[glyph_id]}{x}, {y}{suffixes[glyph_id]}"
+            for glyph_id, x, y in zip(self.glyph_ids[start:stop], self.xs[start:stop], self.ys[start:stop])
+        ))
+
+    def nbytes(self):
+        return sum(arr.itemsize * len(arr) for arr in (self.glyph_ids, self.xs, self.ys))
+
+
+document = GlyphDocument()
+for line in range(10000):
+    document.add_text("Hello, Flyweight!", 'Arial', 'Black', 0, line * 12)
+
+print(f"\n📄 {len(document)} glyphs, {len(document.table.glyphs)} shared flyweights, {document.nbytes() / len(document):.0f} bytes/glyph of extrinsic state")
+document.render_range(0, 3)
+page = io.StringIO()
+document.render_range(0, 17 * 60, out=page)  # A 60-line page as one stream
+print(f"🖨️ Rendered a page of {page.getvalue().count(chr(10))} glyphs")
+
 # 🔑 Key Benefits of the Flyweight Pattern
 # ✔️ Reduces memory consumption – Avoids creating duplicate objects.
 # ✔️ Improves performance – Fewer objects = Less memory allocation.
@@ -56,6 +56,348 @@ internet.connect("stackoverflow.com")  # ✅ Allowed
 # ✅ If the website is blocked, it denies access.
 # ✅ If allowed, it forwards the request to the real Internet object.
 
+# ⚡ Caching Proxy (TTL/LRU Cache, Request Coalescing, Rate Limiting)
+# The proxy above forwards every allowed request upstream. CachingProxyInternet answers repeat requests
+# from a bounded TTL/LRU cache, coalesces concurrent misses for the same site into one upstream call
+# (single-flight), and can throttle each client with a token bucket.
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class SlowInternet:
+    # Local stand-in for the upstream, with injected latency
+    def __init__(self, latency=0.02):
+        self.latency = latency
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def connect(self, website):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return f"<html>{website}</html>"
+
+
+class RateLimitExceeded(Exception):
+    pass
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate  # Tokens added per second
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class CachingProxyInternet(ProxyInternet):
+    def __init__(self, upstream=None, ttl=30.0, maxsize=1000, rate=None, burst=None):
+        super().__init__()
+        self.real_internet = upstream or self.real_internet
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.cache = OrderedDict()  # website -> (response, expires_at)
+        self.in_flight = {}
+        self.lock = threading.Lock()
+        self.rate = rate
+        self.burst = burst or rate
+        self.buckets = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _check_rate(self, client_id):
+        if self.rate is None or client_id is None:
+            return
+        with self.lock:
+            bucket = self.buckets.get(client_id)
+            if bucket is None:
+                bucket = self.buckets[client_id] = TokenBucket(self.rate, self.burst)
+            if not bucket.take():
+                raise RateLimitExceeded(f"Client {client_id} is over its rate limit")
+
+    def connect(self, website, client_id=None):
+        if website in self.blocked_sites:
+            print(f"Access to {website} is BLOCKED ❌")
+            return None
+        self._check_rate(client_id)
+        with self.lock:
+            cached = self.cache.get(website)
+            if cached is not None and cached[1] > time.monotonic():
+                self.cache.move_to_end(website)
+                self.hits += 1
+                return cached[0]
+            self.misses += 1
+            flight = self.in_flight.get(website)
+            leader = flight is None
+            if leader:
+                flight = self.in_flight[website] = InFlight()
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()  # Someone is already fetching this site; share their answer
+            if flight.error:
+                raise flight.error
+            return flight.response
+        try:
+            flight.response = self.real_internet.connect(website)
+            with self.lock:
+                self.cache[website] = (flight.response, time.monotonic() + self.ttl)
+                self.cache.move_to_end(website)
+                while len(self.cache) > self.maxsize:
+                    self.cache.popitem(last=False)
+            return flight.response
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[website]
+            flight.done.set()
+
+
+def benchmark_proxy(proxy, sites, requests=400, workers=32):
+    latencies = []
+
+    def timed_request(i):
+        started = time.perf_counter()
+        proxy.connect(sites[(i * i) % len(sites)])  # Skewed towards a few popular sites
+        latencies.append(time.perf_counter() - started)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(timed_request, range(requests)))
+    latencies.sort()
+    return {
+        "hit_rate": proxy.hits / (proxy.hits + proxy.misses),
+        "coalesced": proxy.coalesced,
+        "upstream_calls": proxy.real_internet.calls,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+    }
+
+
+caching_proxy = CachingProxyInternet(upstream=SlowInternet(latency=0.02), ttl=5)
+print("\n🔹 **Caching proxy benchmark**")
+print(f"📊 {benchmark_proxy(caching_proxy, [f'site{i}.com' for i in range(20)])}")
+
+limited_proxy = CachingProxyInternet(upstream=SlowInternet(latency=0), rate=1, burst=2)
+for attempt in range(3):
+    try:
+        limited_proxy.connect("google.com", client_id="laptop-42")
+        print(f"✅ Request {attempt + 1} allowed")
+    except RateLimitExceeded as e:
+        print(f"⛔ Request {attempt + 1}: {e}")
+
+# 🚫 Scalable Blocklists (Suffix Rules, Memory-Mapped Lists, Atomic Reloads)
+# blocked_sites is a tiny set matched on the exact string. Real lists have millions of entries and
+# "*.example.com" rules. Both engines below check a hostname once per label suffix:
+#   • HashedBlocklist keeps exact names and wildcard suffixes in two sets (fast lookups, slower to load).
+#   • MappedBlocklist binary-searches a sorted file through mmap, so "loading" is opening a file.
+# The proxy swaps in a new blocklist with one reference assignment, so requests never pause on a reload.
+import mmap
+import os
+import tempfile
+
+
+def normalize_host(host):
+    return host.strip().lower().rstrip(".")
+
+
+def reversed_labels(host):
+    return ".".join(reversed(host.split(".")))
+
+
+def parse_rule(rule):
+    # "*.example.com" blocks every subdomain of example.com; "example.com" blocks only that name
+    rule = normalize_host(rule)
+    if rule.startswith("*."):
+        return rule[2:], True
+    return rule, False
+
+
+def suffixes(host):
+    # example.com, b.example.com, a.b.example.com for "a.b.example.com" (proper suffixes first)
+    labels = host.split(".")
+    return [".".join(labels[i:]) for i in range(len(labels) - 1, -1, -1)]
+
+
+class HashedBlocklist:
+    def __init__(self, rules=()):
+        self.exact = set()
+        self.wildcards = set()
+        for rule in rules:
+            domain, wildcard = parse_rule(rule)
+            (self.wildcards if wildcard else self.exact).add(domain)
+
+    def is_blocked(self, host):
+        host = normalize_host(host)
+        if host in self.exact:
+            return True
+        return any(suffix in self.wildcards for suffix in suffixes(host)[:-1])
+
+    def close(self):
+        pass  # Nothing to release; here so engines can be swapped and closed alike
+
+
+def write_blocklist(path, rules):
+    # One "reversed.domain flag" line per rule, sorted, where flag is "=" (exact) or "*" (subdomains)
+    lines = sorted(
+        f"{reversed_labels(domain)} {'*' if wildcard else '='}".encode()
+        for domain, wildcard in map(parse_rule, rules)
+    )
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(b"\n".join(lines) + b"\n")
+    os.replace(tmp_path, path)
+
+
+class BlocklistClosed(ValueError):
+    pass
+
+
+class MappedBlocklist:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size = len(self.map)
+        self.lock = threading.Lock()
+        self.readers = 0  # Lookups in progress; close() waits for them before unmapping
+        self.closing = False
+
+    def close(self):
+        # Unmaps now, or as soon as the lookups still running on this list finish
+        with self.lock:
+            self.closing = True
+            if not self.readers and self.map is not None:
+                self.map.close()
+                self.map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _line_from(self, pos):
+        # The first complete line starting at or after pos
+        if pos > 0:
+            newline = self.map.find(b"\n", pos - 1)
+            if newline == -1:
+                return None
+            pos = newline + 1
+        if pos >= self.size:
+            return None
+        end = self.map.find(b"\n", pos)
+        return pos, (self.size if end == -1 else end)
+
+    def _flags(self, reversed_domain):
+        key = reversed_domain.encode() + b" "
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            line = self._line_from(mid)
+            if line is None or self.map[line[0]:line[1]] >= key:
+                hi = mid
+            else:
+                lo = mid + 1
+        flags = set()
+        line = self._line_from(lo)
+        while line is not None and self.map[line[0]:line[1]].startswith(key):
+            flags.add(self.map[line[1] - 1:line[1]])
+            line = self._line_from(line[1] + 1)
+        return flags
+
+    def is_blocked(self, host):
+        with self.lock:
+            if self.closing:
+                raise BlocklistClosed("blocklist is closed")
+            self.readers += 1
+        try:
+            host = normalize_host(host)
+            for suffix in suffixes(host):
+                flags = self._flags(reversed_labels(suffix))
+                if b"*" in flags and suffix != host:
+                    return True
+                if b"=" in flags and suffix == host:
+                    return True
+            return False
+        finally:
+            with self.lock:
+                self.readers -= 1
+                if self.closing and not self.readers:
+                    self.map.close()
+                    self.map = None
+
+
+class BlocklistProxyInternet(ProxyInternet):
+    def __init__(self, blocklist):
+        super().__init__()
+        self.blocklist = blocklist
+
+    def reload(self, blocklist):
+        old = self.blocklist
+        self.blocklist = blocklist  # Atomic swap: in-flight lookups finish on the old list
+        old.close()  # Releases the old mapping once those lookups are done
+
+    def is_blocked(self, website):
+        while True:
+            try:
+                return self.blocklist.is_blocked(website)
+            except BlocklistClosed:
+                continue  # Swapped out between reading self.blocklist and the lookup: use the new list
+
+    def close(self):
+        self.blocklist.close()
+
+    def connect(self, website):
+        if self.is_blocked(website):
+            print(f"Access to {website} is BLOCKED ❌")
+        else:
+            self.real_internet.connect(website)
+
+
+print("\n🔹 **Scalable blocklists**")
+rules = [f"tracker{i}.ads{i % 997}.net" for i in range(200000)] + ["*.example.com", "facebook.com"]
+with tempfile.TemporaryDirectory() as blocklist_dir:
+    blocklist_path = os.path.join(blocklist_dir, "blocklist.txt")
+    write_blocklist(blocklist_path, rules)
+
+    for name, build in (("hashed", lambda: HashedBlocklist(rules)), ("mapped", lambda: MappedBlocklist(blocklist_path))):
+        started = time.perf_counter()
+        engine = build()
+        load_ms = (time.perf_counter() - started) * 1000
+        hosts = ["tracker42.ads42.net", "cdn.example.com", "example.com", "facebook.com", "m.facebook.com", "google.com"]
+        started = time.perf_counter()
+        verdicts = [engine.is_blocked(host) for host in hosts * 1000]
+        lookup_us = (time.perf_counter() - started) / len(verdicts) * 1e6
+        engine.close()
+        print(f"🚫 {name}: load {load_ms:.1f} ms, {lookup_us:.1f} µs/lookup, {dict(zip(hosts, verdicts))}")
+
+    blocklist_proxy = BlocklistProxyInternet(HashedBlocklist(["facebook.com"]))
+    blocklist_proxy.connect("cdn.example.com")  # ✅ Allowed by the old list
+    blocklist_proxy.reload(MappedBlocklist(blocklist_path))
+    blocklist_proxy.connect("cdn.example.com")  # ❌ Blocked after the swap
+    blocklist_proxy.reload(MappedBlocklist(blocklist_path))  # Closes the previous mapping
+    blocklist_proxy.close()
+
 # 🔑 Key Benefits of the Proxy Pattern
 # ✔️ Controls access – Restricts or filters interactions with the real object.
 # ✔️ Lazy initialization – Delays object creation until it's actually needed.
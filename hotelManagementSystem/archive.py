@@ -0,0 +1,186 @@
+from entities import BookingStatus
+from compact_booking import BookingView
+from threading import Thread, Event, Lock
+from datetime import datetime, timedelta
+import gzip
+import json
+import os
+
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+
+ARCHIVABLE_STATUSES = (BookingStatus.CANCELED, BookingStatus.EXPIRED)
+
+
+def booking_record(booking: BookingView):
+    return {
+        "id": str(booking.id),
+        "user_id": booking.user_id,
+        "room_id": booking.room_id,
+        "check_in_date": booking.check_in_date.isoformat(),
+        "check_out_date": booking.check_out_date.isoformat(),
+        "price": booking.price,
+        "status": booking.status.value,
+        "booking_datetime": booking.booking_datetime.isoformat(),
+    }
+
+
+class BookingArchive:
+    """Append-only cold storage for bookings as gzip-compressed JSONL chunks.
+
+    Every chunk has a small sidecar index of the booking and user ids it
+    holds, so a lookup only decompresses the chunks that can contain a match.
+    Several processes can share one directory: chunk names are claimed with
+    an exclusive create, and each process picks up the others' sidecars when
+    the directory changes.
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.lock = Lock()
+        self.booking_index = {}
+        self.user_index = {}
+        self.indexed = set()
+        self.next_chunk = 0
+        self.seen_mtime = None
+        os.makedirs(directory, exist_ok=True)
+        self.refresh()
+
+    def refresh(self):
+        """Index sidecars written since the last refresh, by this or any other process."""
+        mtime = os.stat(self.directory).st_mtime_ns
+        if mtime == self.seen_mtime:
+            return
+        with self.lock:
+            # Stamped before listing, so a sidecar landing during the scan triggers another one
+            self.seen_mtime = mtime
+            for name in sorted(os.listdir(self.directory)):
+                if name.endswith(".idx.json") and name[:-len(".idx.json")] not in self.indexed:
+                    with open(os.path.join(self.directory, name)) as f:
+                        self._index_chunk(name[:-len(".idx.json")], json.load(f))
+
+    def _index_chunk(self, chunk: str, index: dict):
+        self.indexed.add(chunk)
+        for bookingId in index["booking_ids"]:
+            self.booking_index[bookingId] = chunk
+        for userId in index["user_ids"]:
+            self.user_index.setdefault(userId, set()).add(chunk)
+
+    def append(self, bookings: list):
+        if not bookings:
+            return None
+        records = [booking_record(booking) for booking in bookings]
+        with self.lock:
+            chunk, data_path = self._claim_chunk()
+            with gzip.open(data_path + ".tmp", "wt") as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+            os.replace(data_path + ".tmp", data_path)
+            index = {
+                "booking_ids": [record["id"] for record in records],
+                "user_ids": sorted({record["user_id"] for record in records}),
+            }
+            # The sidecar is written last, so a chunk only becomes visible once its data is complete
+            index_path = os.path.join(self.directory, chunk + ".idx.json")
+            with open(index_path + ".tmp", "w") as f:
+                json.dump(index, f)
+            os.replace(index_path + ".tmp", index_path)
+            self._index_chunk(chunk, index)
+        return chunk
+
+    def _claim_chunk(self):
+        # O_EXCL makes the name ours even if another process is appending to the same directory
+        while True:
+            chunk = f"bookings-{self.next_chunk:08d}"
+            data_path = os.path.join(self.directory, chunk + ".jsonl.gz")
+            self.next_chunk += 1
+            try:
+                os.close(os.open(data_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            except FileExistsError:
+                continue
+            return chunk, data_path
+
+    def _read_chunk(self, chunk: str):
+        with gzip.open(os.path.join(self.directory, chunk + ".jsonl.gz"), "rt") as f:
+            for line in f:
+                yield json.loads(line)
+
+    def get_booking(self, bookingId):
+        chunk = self.booking_index.get(str(bookingId))
+        if chunk is None:
+            # Another process may have archived it since this one last looked
+            self.refresh()
+            chunk = self.booking_index.get(str(bookingId))
+        if chunk is None:
+            return None
+        for record in self._read_chunk(chunk):
+            if record["id"] == str(bookingId):
+                return record
+        return None
+
+    def get_user_bookings(self, userId: str):
+        self.refresh()
+        user_bookings = []
+        for chunk in sorted(self.user_index.get(userId, ())):
+            user_bookings.extend(record for record in self._read_chunk(chunk) if record["user_id"] == userId)
+        return user_bookings
+
+
+class BookingCompactor:
+    """Moves finished bookings out of the hot Manager dict into a BookingArchive.
+
+    Canceled and expired bookings made before the cutoff, and stays that were
+    checked out with a check-out date before it, are archived first and only then deleted from
+    `bookings`, so a crash between the two steps never loses a booking.
+    """
+    def __init__(self, hotel_management_system, archive: BookingArchive, retention_days: int = 30, batch_size: int = 10000):
+        self.hms = hotel_management_system
+        self.archive = archive
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self._stop = Event()
+        self._worker = None
+
+    def _is_archivable(self, booking: BookingView, cutoff: datetime):
+        # A stay only counts as finished once its room was checked out; a CONFIRMED booking
+        # past its dates still has a guest or a room that was never released
+        if booking.status == BookingStatus.CHECKED_OUT:
+            return booking.check_out_date < cutoff.date()
+        return booking.status in ARCHIVABLE_STATUSES and booking.booking_datetime < cutoff
+
+    def compact(self, now: datetime = None):
+        cutoff = (now or datetime.now()) - timedelta(days=self.retention_days)
+        store = self.hms.bookings
+        # One IPC round trip for the snapshot instead of one per booking
+        candidates = [booking for booking in store.views() if self._is_archivable(booking, cutoff)]
+        archived = 0
+        for start in range(0, len(candidates), self.batch_size):
+            batch = candidates[start:start + self.batch_size]
+            with self.hms.lock:
+                # Skip anything that changed state since the snapshot
+                current = store.get_many(booking.id for booking in batch)
+                batch = [booking for booking in current if self._is_archivable(booking, cutoff)]
+                self.archive.append(batch)
+                store.remove(*(booking.id for booking in batch))
+                self.hms.record_change(*(booking.id for booking in batch))
+            archived += len(batch)
+        if archived:
+            logging.info(f"Archived {archived} bookings older than {cutoff.date()}")
+        return archived
+
+    def _run(self, interval: float):
+        while not self._stop.wait(interval):
+            self.compact()
+
+    def start(self, interval: float = 3600):
+        if self._worker is None:
+            self._stop.clear()
+            self._worker = Thread(target=self._run, args=(interval,), daemon=True)
+            self._worker.start()
+
+    def stop(self):
+        if self._worker is not None:
+            self._stop.set()
+            self._worker.join()
+            self._worker = None
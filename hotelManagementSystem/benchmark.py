@@ -0,0 +1,214 @@
+from entities import User, Room, RoomType, RoomStatus
+from hotel_management_system import HotelManagementSystem
+from multiprocessing import Process, Queue
+from multiprocessing.managers import BaseProxy
+from threading import Thread, Lock
+from datetime import date, timedelta
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import random
+import time
+
+
+class InstrumentedLock:
+    """Wraps the system lock and records how long callers wait to acquire it."""
+    def __init__(self, lock):
+        self.lock = lock
+        self.stats_lock = Lock()
+        self.wait_seconds = 0.0
+        self.acquisitions = 0
+
+    def __enter__(self):
+        start = time.perf_counter()
+        self.lock.acquire()
+        waited = time.perf_counter() - start
+        with self.stats_lock:
+            self.wait_seconds += waited
+            self.acquisitions += 1
+        return self
+
+    def __exit__(self, *exc):
+        self.lock.release()
+
+    def acquire(self, *args, **kwargs):
+        return self.lock.acquire(*args, **kwargs)
+
+    def release(self):
+        self.lock.release()
+
+
+class IpcCounter:
+    """Counts every Manager round trip this process makes, whichever proxy it goes through.
+
+    All proxy calls, including DictProxy item access and ListProxy appends,
+    end up in BaseProxy._callmethod, so wrapping it once counts the stores,
+    the indexes, the interner tables and anything added later.
+    """
+    def __init__(self):
+        self.stats_lock = Lock()
+        self.calls = 0
+
+    def install(self):
+        callmethod = BaseProxy._callmethod
+        counter = self
+
+        def counted_callmethod(proxy, methodname, args=(), kwds={}):
+            with counter.stats_lock:
+                counter.calls += 1
+            return callmethod(proxy, methodname, args, kwds)
+
+        BaseProxy._callmethod = counted_callmethod
+        return self
+
+
+def percentile(sorted_values: list, fraction: float):
+    if not sorted_values:
+        return None
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def pick_room(rng: random.Random, room_ids: list, hot_rooms: int, hot_share: float):
+    if hot_rooms and rng.random() < hot_share:
+        return room_ids[rng.randrange(hot_rooms)]
+    return room_ids[rng.randrange(len(room_ids))]
+
+
+def pick_dates(rng: random.Random, start: date, date_span: int, distribution: str, max_nights: int):
+    if distribution == "front-loaded":
+        offset = min(int(rng.expovariate(5 / date_span)), date_span - 1)
+    else:
+        offset = rng.randrange(date_span)
+    check_in = start + timedelta(days=offset)
+    return check_in, check_in + timedelta(days=rng.randint(1, max_nights))
+
+
+def run_thread(hms, config: dict, seed: int, latencies: list, counters: dict):
+    rng = random.Random(seed)
+    room_ids = [f"room{i}" for i in range(config["rooms"])]
+    users = [User(f"user{i}", f"user {i}", f"user{i}@example.com", "0000000000") for i in range(config["users"])]
+    start = date.today()
+    for _ in range(config["ops_per_thread"]):
+        user = users[rng.randrange(len(users))]
+        roomId = pick_room(rng, room_ids, config["hot_rooms"], config["hot_share"])
+        check_in, check_out = pick_dates(rng, start, config["date_span"], config["date_distribution"], config["max_nights"])
+        began = time.perf_counter()
+        result = hms.book_room(user, roomId, check_in, check_out)
+        latencies.append(time.perf_counter() - began)
+        if result is None:
+            counters["rejected"] += 1
+            continue
+        counters["booked"] += 1
+        # Cancel straight away so the room goes back into the pool for the next attempt
+        if rng.random() < config["cancel_ratio"]:
+            began = time.perf_counter()
+            hms.cancel_booking(result["booking"].id)
+            latencies.append(time.perf_counter() - began)
+            counters["canceled"] += 1
+
+
+def run_process(hms, config: dict, process_index: int, results: Queue):
+    logging.disable(logging.INFO)
+    hms.lock = InstrumentedLock(hms.lock)
+    ipc = IpcCounter().install()
+    latencies = []
+    thread_counters = [{"booked": 0, "rejected": 0, "canceled": 0} for _ in range(config["threads"])]
+    threads = [
+        Thread(target=run_thread, args=(hms, config, config["seed"] + process_index * 1000 + i, latencies, thread_counters[i]))
+        for i in range(config["threads"])
+    ]
+    # book_room prints every rejection; keep that out of the report
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    results.put({
+        "latencies": latencies,
+        "counters": {key: sum(counters[key] for counters in thread_counters) for key in thread_counters[0]},
+        "lock_wait_seconds": hms.lock.wait_seconds,
+        "lock_acquisitions": hms.lock.acquisitions,
+        "ipc_calls": ipc.calls,
+    })
+
+
+def run_benchmark(config: dict):
+    logging.disable(logging.INFO)
+    hms = HotelManagementSystem()
+    room_types = list(RoomType)
+    hms.rooms.update({
+        f"room{i}": Room(f"room{i}", room_types[i % len(room_types)], 1000 + 100 * (i % 10), RoomStatus.AVAILABLE)
+        for i in range(config["rooms"])
+    })
+    hms.users.update({
+        f"user{i}": User(f"user{i}", f"user {i}", f"user{i}@example.com", "0000000000")
+        for i in range(config["users"])
+    })
+
+    results = Queue()
+    processes = [Process(target=run_process, args=(hms, config, i, results)) for i in range(config["processes"])]
+    began = time.perf_counter()
+    for process in processes:
+        process.start()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - began
+
+    latencies = sorted(latency for report in reports for latency in report["latencies"])
+    counters = {key: sum(report["counters"][key] for report in reports) for key in ("booked", "rejected", "canceled")}
+    operations = len(latencies)
+    lock_wait = sum(report["lock_wait_seconds"] for report in reports)
+    lock_acquisitions = sum(report["lock_acquisitions"] for report in reports)
+    ipc_calls = sum(report["ipc_calls"] for report in reports)
+    return {
+        "backend": "manager",
+        "config": config,
+        "environment": {"python": platform.python_version(), "cpus": os.cpu_count()},
+        "elapsed_seconds": elapsed,
+        "operations": operations,
+        "counters": counters,
+        "bookings_per_second": counters["booked"] / elapsed if elapsed else None,
+        "operations_per_second": operations / elapsed if elapsed else None,
+        "lock_wait_seconds_total": lock_wait,
+        "lock_wait_seconds_mean": lock_wait / lock_acquisitions if lock_acquisitions else None,
+        "ipc_round_trips_per_operation": ipc_calls / operations if operations else None,
+        "latency_seconds": {
+            "p50": percentile(latencies, 0.50),
+            "p99": percentile(latencies, 0.99),
+            "p999": percentile(latencies, 0.999),
+            "max": latencies[-1] if latencies else None,
+        },
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark HotelManagementSystem under concurrent booking load")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=2, help="threads per process")
+    parser.add_argument("--ops-per-thread", type=int, default=500)
+    parser.add_argument("--rooms", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--hot-rooms", type=int, default=10, help="number of rooms that receive the hot share of traffic")
+    parser.add_argument("--hot-share", type=float, default=0.5, help="fraction of requests sent to the hot rooms")
+    parser.add_argument("--date-span", type=int, default=90, help="days ahead that check-in dates are drawn from")
+    parser.add_argument("--date-distribution", choices=("uniform", "front-loaded"), default="uniform")
+    parser.add_argument("--max-nights", type=int, default=5)
+    parser.add_argument("--cancel-ratio", type=float, default=1.0, help="fraction of successful bookings canceled right away")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    config = {key: value for key, value in vars(args).items() if key != "output"}
+    report = run_benchmark(config)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,111 @@
+from multiprocessing import Array, Value
+from collections import OrderedDict
+from threading import Lock
+import uuid
+import zlib
+
+
+def key_hash(key):
+    # Bookings are stored under their UUID's 128-bit int, so both spellings must hash alike;
+    # crc32 is stable across processes unlike hash()
+    if isinstance(key, uuid.UUID):
+        key = key.int
+    return zlib.crc32(str(key).encode())
+
+
+class ChangeFeed:
+    """Shared-memory ring of recently changed keys, stamped with a global version.
+
+    Writers record a change while holding the system lock. Readers compare the
+    version with the one they last saw, which is a plain shared-memory read, so
+    a process learns that nothing changed without any IPC.
+    """
+    def __init__(self, capacity: int = 65536):
+        self.capacity = capacity
+        self.version = Value("q", 0, lock=False)
+        self.ring = Array("q", capacity, lock=False)
+
+    def record(self, *keys):
+        version = self.version.value
+        for key in keys:
+            self.ring[version % self.capacity] = key_hash(key)
+            version += 1
+        self.version.value = version
+
+    def changes_since(self, version: int):
+        """Return the hashes changed after `version`, or None if they fell off the ring."""
+        current = self.version.value
+        if current - version > self.capacity:
+            return None, current
+        return {self.ring[v % self.capacity] for v in range(version, current)}, current
+
+
+class ReadThroughCache:
+    """Per-process LRU cache in front of a Manager dict, invalidated through a ChangeFeed."""
+    def __init__(self, store, change_feed: ChangeFeed, capacity: int = 10000):
+        self.store = store
+        self.change_feed = change_feed
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.lock = Lock()
+        self.synced_version = change_feed.version.value
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.flushes = 0
+        self.max_version_lag = 0
+
+    def _sync(self):
+        if self.change_feed.version.value == self.synced_version:
+            return
+        changed, version = self.change_feed.changes_since(self.synced_version)
+        self.max_version_lag = max(self.max_version_lag, version - self.synced_version)
+        if changed is None:
+            self.entries.clear()
+            self.flushes += 1
+        else:
+            for key in [key for key in self.entries if key_hash(key) in changed]:
+                del self.entries[key]
+                self.invalidations += 1
+        self.synced_version = version
+
+    def get(self, key, default=None):
+        with self.lock:
+            self._sync()
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            fetched_at = self.synced_version
+        value = self.store.get(key)
+        if value is None:
+            return default
+        with self.lock:
+            # Don't cache a value that a write may have replaced while it was being fetched
+            changed, _ = self.change_feed.changes_since(fetched_at)
+            if changed is None or key_hash(key) in changed:
+                return value
+            self.entries[key] = value
+            if len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "flushes": self.flushes,
+                "synced_version": self.synced_version,
+                "version_lag": self.change_feed.version.value - self.synced_version,
+                "max_version_lag": self.max_version_lag,
+            }
@@ -0,0 +1,317 @@
+from entities import Booking, BookingStatus, BookingNotFoundError
+from datetime import date, datetime
+import uuid
+
+BOOKING_STATUSES = list(BookingStatus)
+
+
+def booking_key(bookingId):
+    """The 128-bit int that records are stored under, from a UUID, int or id string."""
+    if isinstance(bookingId, int):
+        return bookingId
+    if isinstance(bookingId, uuid.UUID):
+        return bookingId.int
+    return uuid.UUID(str(bookingId)).int
+
+
+class IdInterner:
+    """Maps string ids (users, rooms) to small ints so records store each id once.
+
+    The table only ever grows, so it can live in a Manager list shared by all
+    processes while each process keeps a local mirror that it extends on a
+    miss. Writers to a shared table must hold the system lock.
+    """
+    __slots__ = ("values", "index", "shared")
+
+    def __init__(self, shared=None):
+        self.values = []
+        self.index = {}
+        self.shared = shared
+
+    def _refresh(self):
+        if self.shared is not None:
+            for value in self.shared[len(self.values):]:
+                self.index[value] = len(self.values)
+                self.values.append(value)
+
+    def intern(self, value: str):
+        ref = self.find(value)
+        if ref is None:
+            ref = len(self.values)
+            self.values.append(value)
+            self.index[value] = ref
+            if self.shared is not None:
+                self.shared.append(value)
+        return ref
+
+    def lookup(self, ref: int):
+        if ref >= len(self.values):
+            self._refresh()
+        return self.values[ref]
+
+    def find(self, value: str):
+        ref = self.index.get(value)
+        if ref is None:
+            self._refresh()
+            ref = self.index.get(value)
+        return ref
+
+
+class BookingRecord:
+    """Packed booking: a 128-bit int id, interned user/room refs and dates as ordinals."""
+    __slots__ = ("id", "user_ref", "room_ref", "check_in", "check_out", "status", "booked_at", "price", "payment")
+
+    def __init__(self, id: int, user_ref: int, room_ref: int, check_in: int, check_out: int, status: int, booked_at: int, price: float = None, payment=None):
+        self.id = id
+        self.user_ref = user_ref
+        self.room_ref = room_ref
+        self.check_in = check_in
+        self.check_out = check_out
+        self.status = status
+        self.booked_at = booked_at
+        self.price = price
+        self.payment = payment
+
+    def __reduce__(self):
+        # Pickle as a flat tuple instead of a per-field dict
+        return (BookingRecord, (self.id, self.user_ref, self.room_ref, self.check_in,
+                                self.check_out, self.status, self.booked_at, self.price, self.payment))
+
+    @classmethod
+    def from_booking(cls, booking: Booking, users: IdInterner, rooms: IdInterner):
+        return cls(
+            booking_key(booking.id),
+            users.intern(booking.user.id),
+            rooms.intern(booking.room.id),
+            booking.check_in_date.toordinal(),
+            booking.check_out_date.toordinal(),
+            BOOKING_STATUSES.index(booking.status),
+            round(booking.booking_datetime.timestamp() * 1_000_000),
+            booking.price,
+            booking.payment,
+        )
+
+    @classmethod
+    def from_archived(cls, row: dict, users: IdInterner, rooms: IdInterner):
+        return cls(
+            uuid.UUID(row["id"]).int,
+            users.intern(row["user_id"]),
+            rooms.intern(row["room_id"]),
+            date.fromisoformat(row["check_in_date"]).toordinal(),
+            date.fromisoformat(row["check_out_date"]).toordinal(),
+            BOOKING_STATUSES.index(BookingStatus(row["status"])),
+            round(datetime.fromisoformat(row["booking_datetime"]).timestamp() * 1_000_000),
+            row["price"],
+        )
+
+
+class BookingView:
+    """Read-only view over a BookingRecord; fields are decoded on access, nothing is copied."""
+    __slots__ = ("_record", "_store")
+
+    def __init__(self, record: BookingRecord, store):
+        object.__setattr__(self, "_record", record)
+        object.__setattr__(self, "_store", store)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("BookingView is read-only")
+
+    @property
+    def id(self):
+        return uuid.UUID(int=self._record.id)
+
+    @property
+    def user_id(self):
+        return self._store.users.lookup(self._record.user_ref)
+
+    @property
+    def room_id(self):
+        return self._store.rooms.lookup(self._record.room_ref)
+
+    @property
+    def check_in_date(self):
+        return date.fromordinal(self._record.check_in)
+
+    @property
+    def check_out_date(self):
+        return date.fromordinal(self._record.check_out)
+
+    @property
+    def status(self):
+        return BOOKING_STATUSES[self._record.status]
+
+    @property
+    def booking_datetime(self):
+        return datetime.fromtimestamp(self._record.booked_at / 1_000_000)
+
+    @property
+    def price(self):
+        return self._record.price
+
+    @property
+    def payment(self):
+        return self._record.payment
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "room_id": self.room_id,
+            "check_in_date": self.check_in_date,
+            "check_out_date": self.check_out_date,
+            "price": self.price,
+            "status": self.status,
+            "booking_datetime": self.booking_datetime,
+        }
+
+
+class BucketIndex:
+    """Lists of booking ids per key, stored as fixed-size chunks.
+
+    A key's ids are split into tuples of at most `chunk_size` ids stored under
+    (key, n), with the chunk count stored under the key. Adding an id then reads
+    and writes one small chunk however large the list grows, even through a
+    Manager dict. Writers to a shared index must hold the system lock.
+    """
+    chunk_size = 256
+
+    def __init__(self, manager=None):
+        self.counts = {} if manager is None else manager.dict()
+        self.chunks = {} if manager is None else manager.dict()
+
+    def add(self, key, member):
+        count = self.counts.get(key, 0)
+        chunk = self.chunks.get((key, count - 1), ()) if count else ()
+        if not count or len(chunk) >= self.chunk_size:
+            chunk = ()
+            count += 1
+            self.counts[key] = count
+        self.chunks[(key, count - 1)] = chunk + (member,)
+
+    def members(self, key):
+        members = []
+        for n in range(self.counts.get(key, 0)):
+            members.extend(self.chunks.get((key, n), ()))
+        return members
+
+    def discard(self, key, *members):
+        # Only the chunks that held one of `members` are written back
+        removed = set(members)
+        missing = set(removed)
+        for n in range(self.counts.get(key, 0)):
+            if not missing:
+                break
+            chunk = self.chunks.get((key, n), ())
+            if missing.intersection(chunk):
+                missing.difference_update(chunk)
+                self.chunks[(key, n)] = tuple(member for member in chunk if member not in removed)
+
+    def replace(self, key, members):
+        """Rewrite a key's ids in one batch, e.g. after a pass that consumed most of them."""
+        members = tuple(members)
+        count = -(-len(members) // self.chunk_size)
+        self.chunks.update({(key, n): members[n * self.chunk_size:(n + 1) * self.chunk_size] for n in range(count)})
+        for n in range(count, self.counts.get(key, 0)):
+            self.chunks.pop((key, n), None)
+        if count:
+            self.counts[key] = count
+        else:
+            self.counts.pop(key, None)
+
+
+class CompactBookingStore:
+    """Booking store keyed by 128-bit int id with a per-user index.
+
+    Keeps one slotted record per booking instead of a Booking object graph,
+    and hands out BookingViews so reads never copy the record. Given a
+    Manager, the records, index and id tables are shared between processes;
+    writers must then hold the system lock.
+    """
+    def __init__(self, manager=None):
+        if manager is None:
+            self.users = IdInterner()
+            self.rooms = IdInterner()
+            self.records = {}
+            self.user_index = BucketIndex()
+        else:
+            self.users = IdInterner(manager.list())
+            self.rooms = IdInterner(manager.list())
+            self.records = manager.dict()
+            self.user_index = BucketIndex(manager)
+
+    def add(self, booking: Booking):
+        record = BookingRecord.from_booking(booking, self.users, self.rooms)
+        self.records[record.id] = record
+        self.user_index.add(record.user_ref, record.id)
+        return BookingView(record, self)
+
+    def update(self, *bookings: Booking):
+        """Write back bookings that are already in the store, in one write."""
+        self.records.update({
+            record.id: record for record in (BookingRecord.from_booking(booking, self.users, self.rooms) for booking in bookings)
+        })
+
+    def remove(self, *bookingIds):
+        by_user = {}
+        for bookingId in bookingIds:
+            record = self.records.pop(booking_key(bookingId), None)
+            if record is not None:
+                by_user.setdefault(record.user_ref, set()).add(record.id)
+        for user_ref, removed in by_user.items():
+            self.user_index.discard(user_ref, *removed)
+
+    def _record(self, bookingId):
+        record = self.records.get(booking_key(bookingId))
+        if record is None:
+            raise BookingNotFoundError(f"Booking {bookingId} not found")
+        return record
+
+    def get(self, bookingId):
+        return BookingView(self._record(bookingId), self)
+
+    def get_many(self, bookingIds):
+        records = (self.records.get(booking_key(bookingId)) for bookingId in bookingIds)
+        return [BookingView(record, self) for record in records if record is not None]
+
+    def load(self, bookingId, users, rooms):
+        """Rebuild a full Booking, fetching its user and room from `users` and `rooms`."""
+        record = self.records.get(booking_key(bookingId))
+        if record is None:
+            return None
+        booking = Booking(
+            uuid.UUID(int=record.id),
+            users.get(self.users.lookup(record.user_ref)),
+            rooms.get(self.rooms.lookup(record.room_ref)),
+            date.fromordinal(record.check_in),
+            date.fromordinal(record.check_out),
+            record.price,
+        )
+        booking.status = BOOKING_STATUSES[record.status]
+        booking.booking_datetime = datetime.fromtimestamp(record.booked_at / 1_000_000)
+        booking.payment = record.payment
+        return booking
+
+    def set_status(self, bookingId, status: BookingStatus):
+        record = self._record(bookingId)
+        record.status = BOOKING_STATUSES.index(status)
+        self.records[record.id] = record
+
+    def user_booking_ids(self, userId: str):
+        user_ref = self.users.find(userId)
+        if user_ref is None:
+            return ()
+        return self.user_index.members(user_ref)
+
+    def get_user_bookings(self, userId: str):
+        records = self.records
+        return [BookingView(records[bookingId], self) for bookingId in self.user_booking_ids(userId)]
+
+    def views(self):
+        # One round trip for all records when the store is shared
+        return [BookingView(record, self) for record in self.records.values()]
+
+    def view_archived(self, row: dict):
+        return BookingView(BookingRecord.from_archived(row, self.users, self.rooms), self)
+
+    def __len__(self):
+        return len(self.records)
@@ -0,0 +1,43 @@
+from entities import Booking, BookingStatus
+from compact_booking import BucketIndex, booking_key
+from datetime import date
+
+
+class BookingDateIndex:
+    """Ids of confirmed bookings bucketed by check-in and check-out day.
+
+    Buckets hold booking ids, never Booking copies, so readers load the
+    current booking from the store and re-check it. That makes the buckets
+    lists of candidates: a cancellation or an early check-out leaves its id
+    in place, and process_day_rollover rewrites each of the day's buckets
+    once with the ids it still has to handle. Given a Manager, the buckets
+    are shared between processes and writers must hold the system lock.
+    """
+    def __init__(self, manager=None):
+        self.check_ins = BucketIndex(manager)
+        self.check_outs = BucketIndex(manager)
+
+    @classmethod
+    def from_bookings(cls, bookings):
+        index = cls()
+        for booking in bookings:
+            index.add(booking)
+        return index
+
+    def add(self, booking: Booking):
+        if booking.status != BookingStatus.CONFIRMED:
+            return
+        bookingId = booking_key(booking.id)
+        self.check_ins.add(booking.check_in_date.toordinal(), bookingId)
+        self.check_outs.add(booking.check_out_date.toordinal(), bookingId)
+
+    def arrivals(self, day: date):
+        return self.check_ins.members(day.toordinal())
+
+    def departures(self, day: date):
+        return self.check_outs.members(day.toordinal())
+
+    def retain(self, day: date, arrivals: list, departures: list):
+        """Replace the day's buckets with the ids that still need handling, one batch per bucket."""
+        self.check_ins.replace(day.toordinal(), arrivals)
+        self.check_outs.replace(day.toordinal(), departures)
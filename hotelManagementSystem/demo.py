@@ -55,3 +55,12 @@ print(hotel_booking_system.cancel_booking(booking3["booking"].id))
 
 user1_bookings = hotel_booking_system.get_user_bookings(user1.id)
 print(len(user1_bookings))
+
+
+# Dynamic pricing: reprice the next 30 nights, then book against the table
+from pricing import PricingEngine, PricingRule
+
+pricing_engine = PricingEngine([PricingRule(RoomType.DELUXE, weekend_multiplier=1.25, floor=3000)])
+pricing_engine.reprice(hotel_booking_system, date(2024, 3, 1), 30, occupancy=[0.8] * 30, today=date(2024, 2, 1))
+priced_booking = hotel_booking_system.book_room(user2, room2.id, date(2024, 3, 8), date(2024, 3, 10))
+print(f"Priced stay: {priced_booking['booking'].price}")
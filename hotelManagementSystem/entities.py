@@ -14,6 +14,15 @@ class UserNotFoundError(Exception):
 class BookingCancellationError(Exception):
     pass
 
+class HotelNotFoundError(Exception):
+    pass
+
+class HoldExpiredError(Exception):
+    pass
+
+class PaymentError(Exception):
+    pass
+
 class RoomType(Enum):
     BASIC = "BASIC"
     DELUXE = "DELUXE"
@@ -23,10 +32,25 @@ class RoomStatus(Enum):
     AVAILABLE = "AVAILABLE"
     UNAVAILABLE = "UNAVAILABLE"
     BOOKED = "BOOKED"
+    HELD = "HELD"
     
 class BookingStatus(Enum):
     CONFIRMED = "CONFIRMED"
     CANCELED = "CANCELED"
+    PENDING_PAYMENT = "PENDING_PAYMENT"
+    EXPIRED = "EXPIRED"
+    CHECKED_OUT = "CHECKED_OUT"
+
+class LoyaltyTier(Enum):
+    BASIC = "BASIC"
+    SILVER = "SILVER"
+    GOLD = "GOLD"
+    PLATINUM = "PLATINUM"
+
+class PaymentStatus(Enum):
+    PENDING = "PENDING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
 
 class User:
     def __init__(self,id: str, name: str, email: str,mobile_number: str):
@@ -99,18 +123,21 @@ class Booking:
     id: str,
     user: User,
     room: Room,
-    # hotel: Hotel,
     check_in_date: date,
-    check_out_date: date
+    check_out_date: date,
+    price: float = None,
+    hotel: Hotel = None
     ):
         self.id = id
         self.user = user
         self.room = room
-        # self.hotel = hotel
+        self.hotel = hotel
         self.check_in_date = check_in_date
         self.check_out_date = check_out_date
+        self.price = price
         self.status = BookingStatus.CONFIRMED
         self.booking_datetime = datetime.now()
+        self.payment = None
         
     def cancel(self):
   
@@ -121,4 +148,17 @@ class Booking:
             return ValueError("Booking is not confirmed!")
         
 class Payment:
-    pass
+    def __init__(self, id: str, booking_id, amount: float):
+        self.id = id
+        self.booking_id = booking_id
+        self.amount = amount
+        self.status = PaymentStatus.PENDING
+        self.paid_at = None
+
+    def complete(self):
+        if(self.status == PaymentStatus.PENDING):
+            self.status = PaymentStatus.COMPLETED
+            self.paid_at = datetime.now()
+            return self
+        else:
+            return ValueError("Payment is not pending!")
@@ -0,0 +1,112 @@
+from entities import Booking
+from enum import Enum
+from datetime import datetime
+from multiprocessing import Lock
+import json
+import os
+
+
+class EventType(Enum):
+    BOOKING_HELD = "BOOKING_HELD"
+    BOOKING_CREATED = "BOOKING_CREATED"
+    BOOKING_CANCELED = "BOOKING_CANCELED"
+    CHECKED_IN = "CHECKED_IN"
+    CHECKED_OUT = "CHECKED_OUT"
+    BOOKING_EXPIRED = "BOOKING_EXPIRED"
+
+
+def booking_event(event_type: EventType, booking: Booking):
+    return {
+        "type": event_type.value,
+        "booking_id": str(booking.id),
+        "user_id": booking.user.id,
+        "room_id": booking.room.id,
+        "room_status": booking.room.status.value,
+        "status": booking.status.value,
+        "check_in_date": booking.check_in_date.isoformat(),
+        "check_out_date": booking.check_out_date.isoformat(),
+        "price": booking.price,
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+class EventLog:
+    """Append-only, file-backed log of booking events, one JSON object per line.
+
+    An event's offset is the byte position of its line, so a consumer resumes
+    from any offset with a single seek and never rescans the log.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = Lock()
+        open(self.path, "ab").close()
+
+    def append(self, event: dict):
+        line = (json.dumps(event) + "\n").encode()
+        with self.lock:
+            with open(self.path, "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(line)
+        return offset
+
+    def end_offset(self):
+        return os.path.getsize(self.path)
+
+    def read(self, offset: int, max_events: int = 100, max_bytes: int = 1 << 20):
+        """Return up to `max_events` events starting at `offset` and the offset to resume from."""
+        events = []
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            read_bytes = 0
+            while len(events) < max_events and read_bytes < max_bytes:
+                line = f.readline()
+                # A line without its newline is still being written; leave it for the next read
+                if not line.endswith(b"\n"):
+                    break
+                event = json.loads(line)
+                event["offset"] = offset + read_bytes
+                events.append(event)
+                read_bytes += len(line)
+        return events, offset + read_bytes
+
+    def subscribe(self, name: str, max_batch: int = 100):
+        return Subscription(self, name, max_batch)
+
+
+class Subscription:
+    """A named consumer of an EventLog whose committed offset survives restarts.
+
+    Consumers pull at their own pace in bounded batches, so a slow consumer
+    only grows its own lag and never slows down the booking path.
+    """
+    def __init__(self, event_log: EventLog, name: str, max_batch: int = 100):
+        self.event_log = event_log
+        self.name = name
+        self.max_batch = max_batch
+        self.offset_path = f"{event_log.path}.{name}.offset"
+        self.committed_offset = self._load_offset()
+        self.position = self.committed_offset
+
+    def _load_offset(self):
+        try:
+            with open(self.offset_path) as f:
+                return int(f.read() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def poll(self):
+        events, self.position = self.event_log.read(self.position, self.max_batch)
+        return events
+
+    def commit(self):
+        tmp_path = self.offset_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(str(self.position))
+        os.replace(tmp_path, self.offset_path)
+        self.committed_offset = self.position
+
+    def seek(self, offset: int):
+        self.position = offset
+
+    def lag(self):
+        return self.event_log.end_offset() - self.position
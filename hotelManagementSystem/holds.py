@@ -0,0 +1,183 @@
+from entities import User, Booking, Payment, RoomStatus, BookingStatus, PaymentStatus, RoomNotAvailableError, BookingNotFoundError, HoldExpiredError, PaymentError
+from hotel_management_system import HotelManagementSystem
+from event_log import EventType
+from compact_booking import booking_key
+from threading import Thread, Event, Lock
+from datetime import date
+import heapq
+import time
+import uuid
+
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+
+
+class HoldManager:
+    """Hold-then-pay flow: rooms are held for `ttl_minutes` until payment arrives.
+
+    Pending holds and their expiry times live in the system's shared `holds`
+    dict, so any process can confirm a hold and any running HoldManager can
+    release it, even after the process that placed it has exited. Each
+    manager also keeps a min-heap of the expiry times it knows about, so an
+    expiry pass only pops the holds that are actually due instead of scanning
+    `bookings`, and every room it releases is written back in one batch.
+    """
+    def __init__(self, hotel_management_system: HotelManagementSystem, ttl_minutes: float = 15, clock=time.time):
+        # Expiry times are compared across processes, so the clock must be wall time
+        self.hms = hotel_management_system
+        self.holds = hotel_management_system.holds
+        self.ttl_seconds = ttl_minutes * 60
+        self.clock = clock
+        self.expiry_heap = []
+        self.known = set()
+        self.heap_lock = Lock()
+        self._stop = Event()
+        self._wakeup = Event()
+        self._worker = None
+        self.sync()
+
+    def _push(self, bookingId: int, expires_at: float):
+        # Caller holds heap_lock
+        self.known.add(bookingId)
+        heapq.heappush(self.expiry_heap, (expires_at, bookingId))
+
+    def sync(self):
+        """Add holds placed by other processes, including ones that have exited, to this heap."""
+        holds = self.holds.copy()
+        with self.heap_lock:
+            for bookingId, expires_at in holds.items():
+                if bookingId not in self.known:
+                    self._push(bookingId, expires_at)
+            # Holds gone from the shared dict were confirmed or released; their heap entries are skipped
+            self.known.intersection_update(holds)
+
+    def hold_room(self, user: User, roomId: str, check_in_date: date, check_out_date: date):
+        with self.hms.lock:
+            room = self.hms.rooms.get(roomId)
+            if room is None or room.status != RoomStatus.AVAILABLE:
+                raise RoomNotAvailableError(f"Room {roomId} is not available")
+            room.status = RoomStatus.HELD
+            self.hms.rooms[room.id] = room
+            price = self.hms.quote_price(room, check_in_date, check_out_date)
+            booking = Booking(uuid.uuid4(), user, room, check_in_date, check_out_date, price)
+            booking.status = BookingStatus.PENDING_PAYMENT
+            self.hms.bookings.add(booking)
+            expires_at = self.clock() + self.ttl_seconds
+            self.holds[booking_key(booking.id)] = expires_at
+            self.hms.record_change(room.id, booking.id)
+            self.hms._publish(EventType.BOOKING_HELD, booking)
+        with self.heap_lock:
+            is_earliest = not self.expiry_heap or expires_at < self.expiry_heap[0][0]
+            self._push(booking_key(booking.id), expires_at)
+        if is_earliest:
+            self._wakeup.set()
+        logging.info(f"Room {roomId} held for User {user.id} until payment")
+        return booking
+
+    def confirm_payment(self, bookingId, payment: Payment):
+        bookingId = booking_key(bookingId)
+        with self.hms.lock:
+            expires_at = self.holds.get(bookingId)
+            if expires_at is None:
+                raise BookingNotFoundError(f"No pending hold for booking {uuid.UUID(int=bookingId)}")
+            if expires_at <= self.clock():
+                # Left in place so the next expiry pass releases it with the rest of its batch
+                raise HoldExpiredError(f"Hold for booking {uuid.UUID(int=bookingId)} has expired")
+            booking = self.hms.load_booking(bookingId)
+            # A rejected payment leaves the hold pending until it is paid properly or expires
+            error = self._payment_error(booking, payment)
+            if error is not None:
+                raise error
+            room = booking.room
+            room.status = RoomStatus.BOOKED
+            booking.status = BookingStatus.CONFIRMED
+            booking.payment = payment
+            self.hms.rooms[room.id] = room
+            self.hms.bookings.update(booking)
+            self.hms.date_index.add(booking)
+            del self.holds[bookingId]
+            self.hms.record_change(room.id, bookingId)
+            self.hms._publish(EventType.BOOKING_CREATED, booking)
+        return {"booking": booking, "message": "Room is booked successfully"}
+
+    def _payment_error(self, booking: Booking, payment: Payment):
+        if booking is None or booking.status != BookingStatus.PENDING_PAYMENT:
+            return BookingNotFoundError(f"No pending hold for booking {payment.booking_id}")
+        if str(payment.booking_id) != str(booking.id):
+            return PaymentError(f"Payment {payment.id} is for booking {payment.booking_id}, not {booking.id}")
+        if payment.status != PaymentStatus.PENDING:
+            return PaymentError(f"Payment {payment.id} is {payment.status.value}, not PENDING")
+        if round(payment.amount, 2) != round(booking.price, 2):
+            return PaymentError(f"Payment {payment.id} of {payment.amount} does not match the booking price {booking.price}")
+        if isinstance(payment.complete(), ValueError):
+            return PaymentError(f"Payment {payment.id} could not be completed")
+        return None
+
+    def expire_due(self):
+        """Release every hold whose TTL has passed; returns the released room ids."""
+        now = self.clock()
+        due = []
+        with self.heap_lock:
+            while self.expiry_heap and self.expiry_heap[0][0] <= now:
+                expires_at, bookingId = heapq.heappop(self.expiry_heap)
+                self.known.discard(bookingId)
+                due.append((bookingId, expires_at))
+        if not due:
+            return []
+
+        with self.hms.lock:
+            expired_bookings = {}
+            released_rooms = {}
+            holds = self.holds.copy()
+            for bookingId, expires_at in due:
+                # Confirmed holds, and holds another process already released, are dropped here
+                if holds.get(bookingId) != expires_at:
+                    continue
+                self.holds.pop(bookingId, None)
+                booking = self.hms.load_booking(bookingId)
+                if booking is None or booking.status != BookingStatus.PENDING_PAYMENT:
+                    continue
+                booking.status = BookingStatus.EXPIRED
+                booking.room.status = RoomStatus.AVAILABLE
+                expired_bookings[bookingId] = booking
+                released_rooms[booking.room.id] = booking.room
+            self.hms.bookings.update(*expired_bookings.values())
+            self.hms.rooms.update(released_rooms)
+            self.hms.record_change(*expired_bookings, *released_rooms)
+            for booking in expired_bookings.values():
+                self.hms._publish(EventType.BOOKING_EXPIRED, booking)
+            for booking in expired_bookings.values():
+                try:
+                    self.hms._hand_over(booking.room.id, booking.check_in_date, booking.check_out_date)
+                except RoomNotAvailableError as e:
+                    logging.warning(f"Could not hand over Room {booking.room.id} to the waitlist: {e}")
+        logging.info(f"Released {len(released_rooms)} expired holds")
+        return list(released_rooms)
+
+    def next_expiry(self):
+        with self.heap_lock:
+            return self.expiry_heap[0][0] if self.expiry_heap else None
+
+    def _run(self, max_sleep: float):
+        while not self._stop.is_set():
+            self.sync()
+            self.expire_due()
+            next_expiry = self.next_expiry()
+            timeout = max_sleep if next_expiry is None else min(max(next_expiry - self.clock(), 0), max_sleep)
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+
+    def start(self, max_sleep: float = 60):
+        if self._worker is None:
+            self._stop.clear()
+            self._worker = Thread(target=self._run, args=(max_sleep,), daemon=True)
+            self._worker.start()
+
+    def stop(self):
+        if self._worker is not None:
+            self._stop.set()
+            self._wakeup.set()
+            self._worker.join()
+            self._worker = None
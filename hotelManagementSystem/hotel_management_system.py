@@ -1,8 +1,14 @@
-from entities import User, Room, Booking, RoomStatus, RoomNotAvailableError
+from entities import User, Room, Booking, RoomStatus, BookingStatus, RoomNotAvailableError, BookingNotFoundError, LoyaltyTier
+from event_log import EventType, booking_event
+from compact_booking import CompactBookingStore, BookingView, booking_key
+from date_index import BookingDateIndex
+from cache import ChangeFeed, ReadThroughCache
 # from threading import Lock
+import copy
 import uuid
 from datetime import datetime, date
 import time
+import os
 from multiprocessing import Lock, Manager
 
 import logging
@@ -12,61 +18,300 @@ logging.basicConfig(level=logging.INFO)
 
 class HotelManagementSystem:
     __instance = None
+    cache_capacity = 10000
     def __new__(cls):
         if cls.__instance == None:
             cls.__instance = super().__new__(cls)
             manager = Manager()
             cls.__instance.users = manager.dict() 
             cls.__instance.rooms = manager.dict() 
-            cls.__instance.bookings = manager.dict() 
+            cls.__instance.bookings = CompactBookingStore(manager)
+            cls.__instance.date_index = BookingDateIndex(manager)
+            cls.__instance.holds = manager.dict()  # bookingId key -> hold expiry, see holds.HoldManager
             cls.__instance.lock = Lock()
+            # The current PriceTable and its version, shared so every process quotes the same prices
+            cls.__instance.pricing = manager.dict(version=0, table=None)
+            cls.__instance.price_cache = (0, None)
+            cls.__instance.event_log = None
+            cls.__instance.archive = None
+            cls.__instance.waitlist = None
+            cls.__instance.change_feed = ChangeFeed()
+            cls.__instance.caches = {}
             
         return cls.__instance
         
     def add_user(self, user: User):
-        self.__instance.users[user.id] = user
+        with self.__instance.lock:
+            self.__instance.users[user.id] = user
+            self.record_change(user.id)
     
     def add_room(self, room: Room):
-        self.__instance.rooms[room.id] = room
+        with self.__instance.lock:
+            self.__instance.rooms[room.id] = room
+            self.record_change(room.id)
+
+    def record_change(self, *keys):
+        # Callers must hold the lock and call this after writing the keys to the store
+        self.__instance.change_feed.record(*keys)
+
+    def _cache(self, store_name: str):
+        # Caches are per process: a forked child must not share its parent's entries or locks
+        key = (os.getpid(), store_name)
+        cache = self.__instance.caches.get(key)
+        if cache is None:
+            store = getattr(self.__instance, store_name)
+            if isinstance(store, CompactBookingStore):
+                store = store.records
+            cache = ReadThroughCache(store, self.__instance.change_feed, self.cache_capacity)
+            self.__instance.caches[key] = cache
+        return cache
+
+    def cache_stats(self):
+        pid = os.getpid()
+        return {name: cache.stats() for (cache_pid, name), cache in self.__instance.caches.items() if cache_pid == pid}
+
+    def load_booking(self, bookingId):
+        """Rebuild the full Booking from its compact record; callers must hold the lock."""
+        return self.__instance.bookings.load(bookingId, self._cache("users"), self.__instance.rooms)
+
+    def get_room(self, roomId: str):
+        # A copy, like a Manager read, so callers can't change the cached room behind the store's back
+        room = self._cache("rooms").get(roomId)
+        return copy.copy(room) if room is not None else None
         
+    def set_price_table(self, price_table):
+        # Table first, then version: a reader that sees the new version always finds the new table
+        with self.__instance.lock:
+            pricing = self.__instance.pricing
+            pricing["table"] = price_table
+            pricing["version"] = pricing["version"] + 1
+
+    def _price_table(self):
+        # One small read per quote; the table itself is only fetched again after a reprice
+        version = self.__instance.pricing["version"]
+        cached_version, price_table = self.__instance.price_cache
+        if version != cached_version:
+            price_table = self.__instance.pricing["table"]
+            self.__instance.price_cache = (version, price_table)
+        return price_table
+
+    def set_event_log(self, event_log):
+        self.__instance.event_log = event_log
+
+    def set_archive(self, archive):
+        self.__instance.archive = archive
+
+    def set_waitlist(self, waitlist):
+        # Pass start_waitlist() so all processes share one waitlist; a plain Waitlist only
+        # works when every booking, cancellation and waiter is in this process
+        self.__instance.waitlist = waitlist
+
+    def _publish(self, event_type: EventType, booking: Booking):
+        event_log = self.__instance.event_log
+        if event_log is not None:
+            event_log.append(booking_event(event_type, booking))
+
+    def quote_price(self, room: Room, check_in_date: date, check_out_date: date):
+        price_table = self._price_table()
+        if price_table is not None:
+            price = price_table.quote(room.id, check_in_date, check_out_date)
+            if price is not None:
+                return price
+        nights = max((check_out_date - check_in_date).days, 1)
+        return room.price * nights
+
+    def _reserve(self, user: User, roomId: str, check_in_date: date, check_out_date: date):
+        # Callers must hold the lock
+        room = self.__instance.rooms.get(roomId)
+        if room.status != RoomStatus.AVAILABLE:
+            raise RoomNotAvailableError(f"Room {roomId} is not available")
+        if isinstance(room.book(),ValueError):
+            raise RoomNotAvailableError(f"Room {roomId} is not available")
+        room.status = RoomStatus.BOOKED
+        self.__instance.rooms[room.id] = room
+        price = self.quote_price(room, check_in_date, check_out_date)
+        booking = Booking(uuid.uuid4(), user, room, check_in_date, check_out_date, price)
+        self.__instance.bookings.add(booking)
+        self.__instance.date_index.add(booking)
+        self.record_change(room.id, booking.id)
+        self._publish(EventType.BOOKING_CREATED, booking)
+        logging.info(f"Booking successful for User {user.id} in Room {roomId}")
+        return booking
+
     def book_room(self, user: User, roomId: str, check_in_date: date, check_out_date: date):
         try:
             with self.__instance.lock:
-                room = self.__instance.rooms.get(roomId)
-                if room.status != RoomStatus.AVAILABLE:
-                    raise RoomNotAvailableError(f"Room {roomId} is not available")
-                if isinstance(room.book(),ValueError):
-                    raise RoomNotAvailableError(f"Room {roomId} is not available")
-                else:
-                    room.status = RoomStatus.BOOKED
-                    self.__instance.rooms[room.id] = room
-                    booking = Booking(uuid.uuid4(), user, room, check_in_date, check_out_date)
-                    self.__instance.bookings[booking.id] = booking
-                    logging.info(f"Booking successful for User {user.id} in Room {roomId}")
-                    return {"booking": booking, "message": "Room is booked successfully"}
+                booking = self._reserve(user, roomId, check_in_date, check_out_date)
+                return {"booking": booking, "message": "Room is booked successfully"}
         except (RoomNotAvailableError) as e:
             print(str(e))
+
+    def book_or_wait(self, user: User, roomId: str, check_in_date: date, check_out_date: date, tier: LoyaltyTier = LoyaltyTier.BASIC):
+        """Book the room, or join its waitlist if it is taken.
+
+        Returns the booking response, or a WaitlistEntry whose `wait()` returns
+        the booking once a cancellation or an expired hold, in any process,
+        hands over the room for a stay that covers the requested dates.
+        """
+        with self.__instance.lock:
+            try:
+                booking = self._reserve(user, roomId, check_in_date, check_out_date)
+                return {"booking": booking, "message": "Room is booked successfully"}
+            except RoomNotAvailableError as e:
+                if self.__instance.waitlist is None:
+                    print(str(e))
+                    return None
+                # Joining under the lock means a cancellation can't slip in between
+                entry = self.__instance.waitlist.join(user, roomId, check_in_date, check_out_date, tier)
+                entry.waitlist = self.__instance.waitlist
+                return entry
+
+    def _hand_over(self, roomId: str, check_in_date: date, check_out_date: date):
+        # Callers must hold the lock and have just freed the room for these dates
+        waitlist = self.__instance.waitlist
+        if waitlist is None:
+            return None
+        entry = waitlist.pop_next(roomId, check_in_date, check_out_date)
+        if entry is None:
+            return None
+        try:
+            booking = self._reserve(entry.user, roomId, entry.check_in_date, entry.check_out_date)
+        except Exception:
+            # Keep the waiter's place in line if the room could not be reserved after all
+            waitlist.requeue(entry.id)
+            raise
+        waitlist.fulfil(entry.id, booking)
+        return booking
             
     def cancel_booking(self, bookingId: str):
-        booking = self.__instance.bookings.get(bookingId)
-        booking_response = booking.cancel()
-        if isinstance(booking_response,ValueError):
-            return "Can not cancel booking,try reaching support team."
-        else:
-            self.__instance.bookings[bookingId] = booking_response
-            room = booking_response.room
-            room.status = RoomStatus.AVAILABLE
+        with self.__instance.lock:
+            booking = self.load_booking(bookingId)
+            if booking is None:
+                raise BookingNotFoundError(f"Booking {bookingId} not found")
+            booking_response = booking.cancel()
+            if isinstance(booking_response,ValueError):
+                return "Can not cancel booking,try reaching support team."
+            else:
+                self.__instance.bookings.update(booking_response)
+                room = booking_response.room
+                room.status = RoomStatus.AVAILABLE
+                self.__instance.rooms[room.id] = room
+                self.record_change(bookingId, room.id)
+                self._publish(EventType.BOOKING_CANCELED, booking_response)
+                try:
+                    self._hand_over(room.id, booking_response.check_in_date, booking_response.check_out_date)
+                except RoomNotAvailableError as e:
+                    logging.warning(f"Could not hand over Room {room.id} to the waitlist: {e}")
+                return "Booking is canceled"
+
+    def _transition_room(self, bookingId, transition: str, event_type: EventType, booking_status: BookingStatus = None):
+        with self.__instance.lock:
+            booking = self.load_booking(bookingId)
+            if booking is None:
+                raise BookingNotFoundError(f"Booking {bookingId} not found")
+            if booking.status != BookingStatus.CONFIRMED:
+                return ValueError("Booking is not confirmed!")
+            room = booking.room
+            response = getattr(room, transition)()
+            if isinstance(response, ValueError):
+                return response
             self.__instance.rooms[room.id] = room
-            return "Booking is canceled"
+            if booking_status is not None:
+                booking.status = booking_status
+            self.__instance.bookings.update(booking)
+            self.record_change(room.id, bookingId)
+            self._publish(event_type, booking)
+            return response
+
+    def check_in(self, bookingId):
+        return self._transition_room(bookingId, "check_in", EventType.CHECKED_IN)
+
+    def check_out(self, bookingId):
+        return self._transition_room(bookingId, "check_out", EventType.CHECKED_OUT, BookingStatus.CHECKED_OUT)
             
-    def get_user_bookings(self,userId: str):
-        user = self.__instance.users.get(userId)
+    def process_day_rollover(self, day: date, date_index: BookingDateIndex = None):
+        """Check out the day's departures and check in its arrivals in one pass.
+
+        Booking ids come from the date index filled by every confirmed booking.
+        Each booking is re-read from the store and re-checked, transitions are
+        validated with Room.check_out/check_in against a single snapshot of
+        the rooms, and everything is committed with one update per dict. The
+        day's buckets are then rewritten once, keeping only the bookings that
+        failed to transition, so a later run can retry them.
+        """
+        with self.__instance.lock:
+            if date_index is None:
+                date_index = self.__instance.date_index
+            rooms = self.__instance.rooms.copy()
+            users = self._cache("users")
+            changed_rooms = {}
+            changed_bookings = {}
+            events = []
+            result = {"checked_out": [], "checked_in": [], "errors": []}
+            retry_departures, retry_arrivals = [], []
+            # Departures go first so a room can turn over on the same day
+            for bookingIds, transition, event_type, booking_status, done, retry in (
+                (date_index.departures(day), "check_out", EventType.CHECKED_OUT, BookingStatus.CHECKED_OUT, result["checked_out"], retry_departures),
+                (date_index.arrivals(day), "check_in", EventType.CHECKED_IN, None, result["checked_in"], retry_arrivals),
+            ):
+                for bookingId in bookingIds:
+                    booking = changed_bookings.get(bookingId) or self.__instance.bookings.load(bookingId, users, rooms)
+                    if booking is None or booking.status != BookingStatus.CONFIRMED or booking.room is None:
+                        # Canceled or moved on since it was indexed
+                        continue
+                    room = booking.room
+                    response = getattr(room, transition)()
+                    if isinstance(response, ValueError):
+                        result["errors"].append((booking.id, str(response)))
+                        retry.append(bookingId)
+                        continue
+                    changed_rooms[room.id] = room
+                    if booking_status is not None:
+                        booking.status = booking_status
+                    changed_bookings[bookingId] = booking
+                    events.append((event_type, booking))
+                    done.append(booking.id)
+            self.__instance.rooms.update(changed_rooms)
+            self.__instance.bookings.update(*changed_bookings.values())
+            date_index.retain(day, retry_arrivals, retry_departures)
+            self.record_change(*changed_rooms, *changed_bookings)
+            for event_type, booking in events:
+                self._publish(event_type, booking)
+        logging.info(f"Rollover for {day}: {len(result['checked_out'])} check outs, {len(result['checked_in'])} check ins, {len(result['errors'])} errors")
+        return result
+
+    def get_booking(self, bookingId, include_archived: bool = False):
+        record = self._cache("bookings").get(booking_key(bookingId))
+        if record is not None:
+            # Views are read-only, so the cached record can be shared without a copy
+            return BookingView(record, self.__instance.bookings)
+        if include_archived and self.__instance.archive is not None:
+            row = self.__instance.archive.get_booking(bookingId)
+            if row is not None:
+                return self._archived_views([row])[0]
+        return None
+
+    def _archived_views(self, rows: list):
+        # Same BookingView shape as live bookings. Archived rows may name ids this process has
+        # never interned, and interning writes the shared tables, so it happens under the lock.
+        with self.__instance.lock:
+            return [self.__instance.bookings.view_archived(row) for row in rows]
+
+    def get_user_bookings(self,userId: str, include_archived: bool = False):
+        user = self._cache("users").get(userId)
         if(user):
+            # Read-only views over the cached records: nothing is copied and nothing can be mutated
+            store = self.__instance.bookings
+            records = self._cache("bookings")
             user_bookings = []
-            for bookingId in self.__instance.bookings:
-                booking = self.__instance.bookings[bookingId]
-                if(booking.user.id == user.id):
-                    user_bookings.append(booking.__dict__)
+            for bookingId in store.user_booking_ids(user.id):
+                record = records.get(bookingId)
+                if record is not None:
+                    user_bookings.append(BookingView(record, store))
+            if include_archived and self.__instance.archive is not None:
+                archived = self.__instance.archive.get_user_bookings(user.id)
+                if archived:
+                    user_bookings.extend(self._archived_views(archived))
             return user_bookings
         else:
             return "There is no user with this id"
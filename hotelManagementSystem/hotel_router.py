@@ -0,0 +1,164 @@
+from entities import User, Hotel, Room, Booking, RoomType, RoomStatus, RoomNotAvailableError, BookingNotFoundError, HotelNotFoundError
+from multiprocessing import Process, Pipe
+from threading import Lock
+from datetime import date
+import uuid
+
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+
+
+class HotelShard:
+    """Rooms and bookings of a single hotel, owned by exactly one worker process.
+
+    The state lives in plain dicts inside the worker, so none of the calls
+    below pay for Manager IPC; the router's pipe is the only way in.
+    """
+    def __init__(self, hotel: Hotel):
+        self.hotel = hotel
+        self.rooms = {}
+        self.bookings = {}
+        self.lock = Lock()
+
+    def add_room(self, room: Room):
+        with self.lock:
+            self.rooms[room.id] = room
+
+    def book_room(self, user: User, roomId: str, check_in_date: date, check_out_date: date, price: float = None):
+        with self.lock:
+            room = self.rooms.get(roomId)
+            if room is None or room.status != RoomStatus.AVAILABLE:
+                raise RoomNotAvailableError(f"Room {roomId} is not available")
+            room.book()
+            if price is None:
+                price = room.price * max((check_out_date - check_in_date).days, 1)
+            booking = Booking(uuid.uuid4(), user, room, check_in_date, check_out_date, price, self.hotel)
+            self.bookings[booking.id] = booking
+            return booking
+
+    def cancel_booking(self, bookingId):
+        with self.lock:
+            booking = self.bookings.get(bookingId)
+            if booking is None:
+                raise BookingNotFoundError(f"Booking {bookingId} not found")
+            if isinstance(booking.cancel(), ValueError):
+                return "Can not cancel booking,try reaching support team."
+            booking.room.status = RoomStatus.AVAILABLE
+            return "Booking is canceled"
+
+    def search_available_rooms(self, room_type: RoomType = None, max_price: float = None):
+        with self.lock:
+            return [
+                room for room in self.rooms.values()
+                if room.status == RoomStatus.AVAILABLE
+                and (room_type is None or room.type == room_type)
+                and (max_price is None or room.price <= max_price)
+            ]
+
+    def get_user_bookings(self, userId: str):
+        with self.lock:
+            return [booking for booking in self.bookings.values() if booking.user.id == userId]
+
+
+def _serve_shard(hotel: Hotel, conn):
+    shard = HotelShard(hotel)
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        method, args = message
+        try:
+            conn.send((True, getattr(shard, method)(*args)))
+        except Exception as e:
+            conn.send((False, e))
+    conn.close()
+
+
+class HotelRouter:
+    """Routes requests to one worker process per hotel.
+
+    Each hotel is an independent shard with its own rooms, bookings and lock,
+    so bookings in different hotels never contend and throughput grows with
+    the number of hotels up to the number of cores.
+    """
+    def __init__(self):
+        self.hotels = {}
+        self.shards = {}
+
+    def add_hotel(self, hotel: Hotel):
+        if hotel.id in self.shards:
+            return
+        parent_conn, child_conn = Pipe()
+        worker = Process(target=_serve_shard, args=(hotel, child_conn), daemon=True)
+        worker.start()
+        child_conn.close()
+        self.hotels[hotel.id] = hotel
+        self.shards[hotel.id] = (worker, parent_conn, Lock())
+        logging.info(f"Started shard for Hotel {hotel.id}")
+
+    def _shard(self, hotelId: str):
+        shard = self.shards.get(hotelId)
+        if shard is None:
+            raise HotelNotFoundError(f"There is no hotel with id {hotelId}")
+        return shard
+
+    def _call(self, hotelId: str, method: str, *args):
+        _, conn, lock = self._shard(hotelId)
+        with lock:
+            conn.send((method, args))
+            ok, result = conn.recv()
+        if not ok:
+            raise result
+        return result
+
+    def add_room(self, hotelId: str, room: Room):
+        self._call(hotelId, "add_room", room)
+
+    def book_room(self, hotelId: str, user: User, roomId: str, check_in_date: date, check_out_date: date, price: float = None):
+        try:
+            booking = self._call(hotelId, "book_room", user, roomId, check_in_date, check_out_date, price)
+            logging.info(f"Booking successful for User {user.id} in Room {roomId} of Hotel {hotelId}")
+            return {"booking": booking, "message": "Room is booked successfully"}
+        except (RoomNotAvailableError) as e:
+            print(str(e))
+
+    def cancel_booking(self, hotelId: str, bookingId):
+        return self._call(hotelId, "cancel_booking", bookingId)
+
+    def _broadcast(self, method: str, *args):
+        # Send to every shard before waiting on any, so the shards work in parallel.
+        # Locks are taken in hotel id order to stay deadlock free against other broadcasts.
+        hotelIds = sorted(self.shards)
+        shards = [self.shards[hotelId] for hotelId in hotelIds]
+        for _, _, lock in shards:
+            lock.acquire()
+        try:
+            for _, conn, _ in shards:
+                conn.send((method, args))
+            replies = [conn.recv() for _, conn, _ in shards]
+        finally:
+            for _, _, lock in shards:
+                lock.release()
+        results = {}
+        for hotelId, (ok, result) in zip(hotelIds, replies):
+            if not ok:
+                raise result
+            results[hotelId] = result
+        return results
+
+    def search_available_rooms(self, room_type: RoomType = None, max_price: float = None):
+        return self._broadcast("search_available_rooms", room_type, max_price)
+
+    def get_user_bookings(self, userId: str):
+        return self._broadcast("get_user_bookings", userId)
+
+    def shutdown(self):
+        for worker, conn, lock in self.shards.values():
+            with lock:
+                conn.send(None)
+            worker.join()
+            conn.close()
+        self.shards.clear()
+        self.hotels.clear()
@@ -0,0 +1,147 @@
+from entities import RoomType
+from datetime import date
+from itertools import accumulate
+import bisect
+
+try:
+    import numpy as np
+except ImportError:  # Tables are built with plain Python lists without NumPy
+    np = None
+
+
+class PricingRule:
+    def __init__(self,
+    room_type: RoomType,
+    base_multiplier: float = 1.0,
+    weekend_multiplier: float = 1.0,
+    last_minute_days: int = 0,
+    last_minute_multiplier: float = 1.0,
+    floor: float = 0.0,
+    ceiling: float = float("inf")
+    ):
+        self.room_type = room_type
+        self.base_multiplier = base_multiplier
+        self.weekend_multiplier = weekend_multiplier
+        self.last_minute_days = last_minute_days
+        self.last_minute_multiplier = last_minute_multiplier
+        self.floor = floor
+        self.ceiling = ceiling
+
+
+class PriceTable:
+    """Nightly prices for every room over a date window, indexed by room and day.
+
+    `prices[row][day]` is the price of one night and `cumulative[row][day]` the
+    total of all nights before `day`, so any stay is quoted with two lookups.
+    """
+    def __init__(self, room_ids: list, start_date: date, prices):
+        self.room_index = {room_id: row for row, room_id in enumerate(room_ids)}
+        self.start_ordinal = start_date.toordinal()
+        self.prices = prices
+        if np is not None:
+            self.days = prices.shape[1]
+            self.cumulative = np.zeros((prices.shape[0], prices.shape[1] + 1))
+            np.cumsum(prices, axis=1, out=self.cumulative[:, 1:])
+        else:
+            self.days = len(prices[0]) if prices else 0
+            self.cumulative = [list(accumulate(row, initial=0.0)) for row in prices]
+
+    def _locate(self, room_id: str, check_in_date: date, check_out_date: date):
+        row = self.room_index.get(room_id)
+        start = check_in_date.toordinal() - self.start_ordinal
+        end = check_out_date.toordinal() - self.start_ordinal
+        if row is None or start < 0 or end > self.days or end <= start:
+            return None
+        return row, start, end
+
+    def nightly_price(self, room_id: str, night: date):
+        located = self._locate(room_id, night, date.fromordinal(night.toordinal() + 1))
+        if located is None:
+            return None
+        row, start, _ = located
+        return float(self.prices[row][start])
+
+    def quote(self, room_id: str, check_in_date: date, check_out_date: date):
+        located = self._locate(room_id, check_in_date, check_out_date)
+        if located is None:
+            return None
+        row, start, end = located
+        return float(self.cumulative[row][end] - self.cumulative[row][start])
+
+
+class PricingEngine:
+    # (occupancy threshold, multiplier): the highest threshold reached applies
+    DEFAULT_OCCUPANCY_TIERS = [(0.0, 0.9), (0.5, 1.0), (0.75, 1.15), (0.9, 1.35)]
+
+    def __init__(self, rules: list = None, occupancy_tiers: list = None):
+        self.rules = {rule.room_type: rule for rule in (rules or [])}
+        tiers = sorted(occupancy_tiers or self.DEFAULT_OCCUPANCY_TIERS)
+        self.tier_thresholds = [threshold for threshold, _ in tiers]
+        self.tier_multipliers = [multiplier for _, multiplier in tiers]
+
+    def _rule(self, room_type: RoomType):
+        return self.rules.get(room_type) or PricingRule(room_type)
+
+    def build_table(self, rooms: list, start_date: date, days: int, occupancy=None, today: date = None):
+        """Price every room for `days` nights starting at `start_date`.
+
+        `occupancy` is the forecast fraction of rooms sold for each night
+        (length `days`); it defaults to an empty hotel.
+        """
+        today = today or date.today()
+        if occupancy is None:
+            occupancy = [0.0] * days
+        if np is None:
+            return PriceTable([room.id for room in rooms], start_date, self._build_rows(rooms, start_date, days, occupancy, today))
+        room_ids = [room.id for room in rooms]
+        types = list(RoomType)
+        type_codes = np.array([types.index(room.type) for room in rooms], dtype=np.intp)
+        base = np.array([room.price for room in rooms], dtype=np.float64)
+
+        rules = [self._rule(room_type) for room_type in types]
+        base_mult = np.array([rule.base_multiplier for rule in rules])[type_codes]
+        weekend_mult = np.array([rule.weekend_multiplier for rule in rules])[type_codes]
+        last_minute_days = np.array([rule.last_minute_days for rule in rules])[type_codes]
+        last_minute_mult = np.array([rule.last_minute_multiplier for rule in rules])[type_codes]
+        floor = np.array([rule.floor for rule in rules])[type_codes]
+        ceiling = np.array([rule.ceiling for rule in rules])[type_codes]
+
+        ordinals = start_date.toordinal() + np.arange(days)
+        # date.weekday() of ordinal 1 (0001-01-01) is Monday, so Fri/Sat nights are 4/5
+        is_weekend = np.isin((ordinals - 1) % 7, (4, 5))
+        lead_time = ordinals - today.toordinal()
+
+        occupancy = np.asarray(occupancy, dtype=np.float64)
+        tier = np.searchsorted(self.tier_thresholds, occupancy, side="right") - 1
+        occupancy_mult = np.array(self.tier_multipliers)[np.clip(tier, 0, None)]
+
+        prices = (base * base_mult)[:, None] * occupancy_mult[None, :]
+        prices = np.where(is_weekend[None, :], prices * weekend_mult[:, None], prices)
+        last_minute = lead_time[None, :] < last_minute_days[:, None]
+        prices = np.where(last_minute, prices * last_minute_mult[:, None], prices)
+        prices = np.clip(prices, floor[:, None], ceiling[:, None])
+        return PriceTable(room_ids, start_date, np.round(prices, 2))
+
+    def _build_rows(self, rooms: list, start_date: date, days: int, occupancy, today: date):
+        # Same rules as build_table, one night at a time
+        occupancy_mult = [self.tier_multipliers[max(bisect.bisect_right(self.tier_thresholds, value) - 1, 0)] for value in occupancy]
+        ordinals = range(start_date.toordinal(), start_date.toordinal() + days)
+        rows = []
+        for room in rooms:
+            rule = self._rule(room.type)
+            row = []
+            for ordinal, multiplier in zip(ordinals, occupancy_mult):
+                price = room.price * rule.base_multiplier * multiplier
+                if (ordinal - 1) % 7 in (4, 5):
+                    price *= rule.weekend_multiplier
+                if ordinal - today.toordinal() < rule.last_minute_days:
+                    price *= rule.last_minute_multiplier
+                row.append(round(min(max(price, rule.floor), rule.ceiling), 2))
+            rows.append(row)
+        return rows
+
+    def reprice(self, hotel_management_system, start_date: date, days: int, occupancy=None, today: date = None):
+        rooms = list(hotel_management_system.rooms.values())
+        table = self.build_table(rooms, start_date, days, occupancy, today)
+        hotel_management_system.set_price_table(table)
+        return table
@@ -0,0 +1,147 @@
+from entities import User, LoyaltyTier
+from multiprocessing.managers import BaseManager
+from threading import Event, Lock
+from datetime import date
+import heapq
+import itertools
+import time
+
+TIER_PRIORITY = {tier: rank for rank, tier in enumerate(LoyaltyTier)}
+
+
+class WaitlistEntry:
+    def __init__(self, entryId: int, user: User, roomId: str, check_in_date: date, check_out_date: date, tier: LoyaltyTier):
+        self.id = entryId
+        self.user = user
+        self.room_id = roomId
+        self.check_in_date = check_in_date
+        self.check_out_date = check_out_date
+        self.tier = tier
+        self.requested_at = time.time()
+        self.waitlist = None
+
+    def __getstate__(self):
+        # The waitlist reference never travels; the receiving side attaches its own proxy
+        state = dict(self.__dict__)
+        state["waitlist"] = None
+        return state
+
+    def priority(self):
+        return (-TIER_PRIORITY[self.tier], self.requested_at, self.id)
+
+    def wait(self, timeout: float = None):
+        """Block until the entry gets a booking instead of retrying book_room in a loop."""
+        return self.waitlist.wait(self.id, timeout)
+
+
+class Waitlist:
+    """Priority queues of users waiting for a sold-out room, per room and date range.
+
+    Higher loyalty tiers go first, then earlier requests. Leaving the list only
+    marks the entry, and marked entries are skipped when they reach the top,
+    so joining, leaving and handing over a room are all O(log n) per range.
+
+    The queues live in one process. Use start_waitlist() to host them in a
+    manager process that every HotelManagementSystem process talks to;
+    `wait` then blocks in that process, so a cancellation made by any process
+    wakes the waiter.
+    """
+    def __init__(self, on_fulfilled=None):
+        self.queues = {}  # roomId -> {(check in ordinal, check out ordinal): heap}
+        self.entries = {}
+        self.canceled = set()
+        self.bookings = {}
+        self.events = {}
+        self.lock = Lock()
+        self.sequence = itertools.count()
+        self.on_fulfilled = on_fulfilled
+
+    def _push(self, entry: WaitlistEntry):
+        ranges = self.queues.setdefault(entry.room_id, {})
+        heap = ranges.setdefault((entry.check_in_date.toordinal(), entry.check_out_date.toordinal()), [])
+        heapq.heappush(heap, entry.priority())
+
+    def join(self, user: User, roomId: str, check_in_date: date, check_out_date: date, tier: LoyaltyTier = LoyaltyTier.BASIC):
+        with self.lock:
+            entry = WaitlistEntry(next(self.sequence), user, roomId, check_in_date, check_out_date, tier)
+            self.entries[entry.id] = entry
+            self.events[entry.id] = Event()
+            self._push(entry)
+        entry.waitlist = self
+        return entry
+
+    def leave(self, entryId: int):
+        with self.lock:
+            if entryId in self.entries:
+                self.canceled.add(entryId)
+
+    def _head(self, heap: list):
+        # Drop entries that left the list while they were queued
+        while heap and heap[0][-1] in self.canceled:
+            entryId = heapq.heappop(heap)[-1]
+            self.canceled.discard(entryId)
+            del self.entries[entryId]
+            self.events.pop(entryId).set()
+        return heap[0] if heap else None
+
+    def pop_next(self, roomId: str, check_in_date: date, check_out_date: date):
+        """Pop the best waiter whose stay fits inside the freed `check_in_date`..`check_out_date`."""
+        freed_in, freed_out = check_in_date.toordinal(), check_out_date.toordinal()
+        with self.lock:
+            ranges = self.queues.get(roomId, {})
+            best = None
+            for (stay_in, stay_out), heap in list(ranges.items()):
+                head = self._head(heap)
+                if head is None:
+                    del ranges[(stay_in, stay_out)]
+                elif freed_in <= stay_in and stay_out <= freed_out and (best is None or head < best[0]):
+                    best = (head, heap)
+            if not ranges:
+                self.queues.pop(roomId, None)
+            if best is None:
+                return None
+            heapq.heappop(best[1])
+            return self.entries[best[0][-1]]
+
+    def requeue(self, entryId: int):
+        # Put a popped entry back with its original priority, e.g. when the handover failed
+        with self.lock:
+            entry = self.entries.get(entryId)
+            if entry is not None:
+                self._push(entry)
+
+    def fulfil(self, entryId: int, booking):
+        with self.lock:
+            entry = self.entries.pop(entryId)
+            self.bookings[entryId] = booking
+            self.events[entryId].set()
+        if self.on_fulfilled:
+            self.on_fulfilled(entry, booking)
+
+    def wait(self, entryId: int, timeout: float = None):
+        event = self.events.get(entryId)
+        if event is None or not event.wait(timeout):
+            return None
+        with self.lock:
+            # The booking is handed out once; the entry is finished after that
+            self.events.pop(entryId, None)
+            return self.bookings.pop(entryId, None)
+
+    def __len__(self):
+        with self.lock:
+            return len(self.entries) - len(self.canceled)
+
+
+class WaitlistManager(BaseManager):
+    pass
+
+
+WaitlistManager.register("Waitlist", Waitlist, exposed=("join", "leave", "pop_next", "requeue", "fulfil", "wait", "__len__"))
+
+
+def start_waitlist():
+    """Start a process hosting one Waitlist and return a proxy that every process can share."""
+    manager = WaitlistManager()
+    manager.start()
+    # The proxy keeps a reference to its manager, so the process lives as long as the proxy
+    return manager.Waitlist()